@@ -0,0 +1,175 @@
+"""
+Microbenchmarks for the primitives that run thousands of times per frame
+
+Results are reported in nanoseconds per call and compared against a stored baseline, so the cost of a change
+to one of the primitives is visible before it ships.
+
+python -m benchmarks.micro                  Compare against benchmarks/baselines/micro.json
+python -m benchmarks.micro --save           Store the current results as the new baseline
+python -m benchmarks.micro --fail-above 10  Exit with an error when anything is over 10% slower
+
+Save the baseline with the interpreter CI uses, and again in the same change that adds a benchmark so every
+benchmark has a number to compare against.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+from typing import Callable
+
+import pygame
+from icecream import ic
+
+from entities.enemy import Enemy
+from entities.enemy_store import EnemyStore
+from scripts.collision_system import SpatialGrid, CollisionManager, NumpyCollisionManager
+from scripts.config import DISPLAY_SIZE
+from scripts.pygame_utils import calculate_pathing, calculate_distance, line_set_distance, location_reached
+from scripts.readable_classes import XYFloat, XYInt
+from weapons.ammo import Normal
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+COLLISION_ENEMIES = 1000
+COLLISION_AMMO = 100
+
+
+def random_location() -> XYFloat:
+    return XYFloat(random.uniform(0, DISPLAY_SIZE.x), random.uniform(0, DISPLAY_SIZE.y))
+
+
+def collision_benchmark(manager_class: type = CollisionManager) -> Callable[[], object]:
+    """A spatial grid filled with a horde and a volley of ammo spread over the screen"""
+    grid = SpatialGrid(cell_size=64)
+    enemies = [Enemy(location=random_location()) for _ in range(COLLISION_ENEMIES)]
+    for enemy in enemies:
+        grid.add_enemy(enemy)
+    manager = manager_class(grid)
+    if isinstance(manager, NumpyCollisionManager):
+        store = EnemyStore()
+        for enemy in enemies:
+            store.append(enemy)
+        manager.set_enemies(store)
+    all_ammo = [Normal(target_location=random_location(), current_location=random_location()) for _ in range(COLLISION_AMMO)]
+    return lambda: manager.batch_check_collisions(all_ammo)
+
+
+def build_benchmarks() -> dict[str, Callable[[], object]]:
+    random.seed(1234)
+
+    a_float, b_float = XYFloat(12.5, 40.25), XYFloat(800.75, 300.5)
+    a_int, b_int = XYInt(12, 40), XYInt(800, 300)
+    grid = SpatialGrid(cell_size=64)
+
+    return {
+        "XYFloat.__init__": lambda: XYFloat(12.5, 40.25),
+        "XYFloat.__add__": lambda: a_float + b_float,
+        "XYFloat.__sub__": lambda: a_float - b_float,
+        "XYFloat.__mul__": lambda: a_float * 1.5,
+        "XYFloat.__truediv__": lambda: a_float / 2,
+        "XYFloat.__hash__": lambda: hash(a_float),
+        "XYFloat.copy": a_float.copy,
+        "XYFloat.to_tuple": a_float.to_tuple,
+        "XYInt.__init__": lambda: XYInt(12, 40),
+        "XYInt.__add__": lambda: a_int + b_int,
+        "XYInt.__sub__": lambda: a_int - b_int,
+        "XYInt.__mul__": lambda: a_int * 2,
+        "XYInt.__hash__": lambda: hash(a_int),
+        "calculate_pathing": lambda: calculate_pathing(a_float, b_float, 60, 1 / 60),
+        "calculate_distance": lambda: calculate_distance(a_float, b_float),
+        "line_set_distance": lambda: line_set_distance(a_float, b_float, 500),
+        "location_reached": lambda: location_reached(a_float, b_float, 500, 1 / 60),
+        "SpatialGrid.get_cell_coords": lambda: grid.get_cell_coords(b_float),
+        f"CollisionManager.batch_check_collisions[{COLLISION_ENEMIES}x{COLLISION_AMMO}]": collision_benchmark(),
+        f"NumpyCollisionManager.batch_check_collisions[{COLLISION_ENEMIES}x{COLLISION_AMMO}]": (
+            collision_benchmark(NumpyCollisionManager)
+        ),
+    }
+
+
+def measure(function: Callable[[], object], repeat: int, min_time: float) -> float:
+    """:return: The fastest time per call out of all repeats in nanoseconds"""
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def load_baseline(path: str) -> dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def save_baseline(path: str, results: dict[str, float]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "results": {name: round(nanoseconds, 1) for name, nanoseconds in results.items()},
+            },
+            file,
+            indent=2,
+        )
+
+
+def report(results: dict[str, float], baseline: dict[str, float]) -> float:
+    """
+    Print the comparison table
+    :return: The worst slowdown against the baseline in percent
+    """
+    worst = 0.0
+    print(f"{'Benchmark':<56}{'ns/call':>12}{'baseline':>12}{'delta ns':>12}{'delta %':>10}")
+    for name, nanoseconds in results.items():
+        if name not in baseline:
+            print(f"{name:<56}{nanoseconds:>12.1f}{'-':>12}{'-':>12}{'-':>10}")
+            continue
+        delta = nanoseconds - baseline[name]
+        percent = delta / baseline[name] * 100
+        worst = max(worst, percent)
+        print(f"{name:<56}{nanoseconds:>12.1f}{baseline[name]:>12.1f}{delta:>+12.1f}{percent:>+9.1f}%")
+    return worst
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for Python Survivors")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds each repeat should take")
+    parser.add_argument("--fail-above", type=float, default=None, help="Fail when a benchmark is this %% slower")
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+
+    pygame.init()
+    ic.disable()
+
+    benchmarks = build_benchmarks()
+    results = {
+        name: measure(function, arguments.repeat, arguments.min_time)
+        for name, function in benchmarks.items()
+        if arguments.filter is None or arguments.filter in name
+    }
+
+    worst = report(results, load_baseline(arguments.baseline))
+
+    if arguments.save:
+        save_baseline(arguments.baseline, results)
+        print(f"Saved baseline to {arguments.baseline}")
+    elif arguments.fail_above is not None and worst > arguments.fail_above:
+        print(f"Slowest regression of {worst:.1f}% is above {arguments.fail_above:.1f}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
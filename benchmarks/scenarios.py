@@ -0,0 +1,267 @@
+"""
+End to end benchmark of scripted scenarios running through Game.run_frame
+
+Every scenario fixes the random seed, the player location, the size of the horde and the amount of live
+projectiles, then reads how long each phase of a frame took from the frame profiler. draw_everything includes
+overlay.update, which is also reported on its own, and weapons is the sum of every weapon's update.
+
+python -m benchmarks.scenarios --enemies 100 1000 5000 20000 --json results.json --csv results.csv
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+from dataclasses import dataclass, field, asdict
+
+# Allow the window to be created on machines without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from icecream import ic
+
+from game_loop import Game
+from scripts.collision_system import HighPerformanceCollisionSystem
+from scripts.config import DISPLAY_SIZE
+from scripts.readable_classes import XYFloat
+from weapons.weapons import Pistol
+
+PHASES: tuple[str, ...] = (
+    "create_enemies",
+    "collision_system.update_enemies",
+    "update_enemies",
+    "update_contact_damage",
+    "update_weapons",
+    "projectile_system.update",
+    "draw_everything",
+    "overlay.update",
+    "draw_screen",
+)
+PERCENTILES: tuple[int, ...] = (50, 90, 99)
+DEFAULT_ENEMY_COUNTS: tuple[int, ...] = (100, 500, 1000, 2000, 5000, 10000, 20000)
+
+
+@dataclass(slots=True)
+class Scenario:
+    name: str
+    enemies: int
+    projectiles: int = 0
+    weapons: int = 1
+    weapon_cooldown: float = 0.5
+    seed: int = 1234
+    player_location: tuple[float, float] = (DISPLAY_SIZE.x / 2, DISPLAY_SIZE.y / 2)
+    frames: int = 120
+    warmup_frames: int = 5
+    delta_time: float = 1 / 60
+    collision_backend: str = "numpy"
+    # The horde spawns over the unzoomed view, so zooming in leaves most of it off screen and culled
+    zoom: float = 1.0
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    scenario: Scenario
+    frame: dict[str, float]
+    phases: dict[str, dict[str, float]] = field(default_factory=dict)
+    # Mean broadphase pair tests and cell size of the collision system per frame
+    pair_tests: float = 0.0
+    cell_size: float = 0.0
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """Nearest rank percentile of already sorted samples"""
+    if not samples:
+        return 0.0
+    index = max(0, min(len(samples) - 1, round(percent / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def summarise(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    summary = {"mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0}
+    for percent in PERCENTILES:
+        summary[f"p{percent}_ms"] = percentile(ordered, percent) * 1000
+    summary["max_ms"] = ordered[-1] * 1000 if ordered else 0.0
+    return summary
+
+
+def fire_projectiles(game: Game, amount: int):
+    """Top up the live projectiles to the requested amount with shots at random points in range, reusing spent ones"""
+    weapons = game.player.weapon_slots
+    live = len(game.projectile_system)
+    player_location = game.player.location_center
+    for index in range(amount - live):
+        weapon = weapons[index % len(weapons)]
+        target = XYFloat(
+            player_location.x + random.uniform(-weapon.attack_range, weapon.attack_range),
+            player_location.y + random.uniform(-weapon.attack_range, weapon.attack_range),
+        )
+        game.projectile_system.add(weapon.spawn_projectile(target, game.player, game.projectile_system), weapon)
+
+
+def load_scenario(scenario: Scenario) -> tuple[Game, float]:
+    """
+    Create a game in the state described by the scenario
+    :return: The game and the total time that makes create_enemies keep the horde at the requested size
+    """
+    random.seed(scenario.seed)
+
+    game = Game(
+        fixed_delta_time=scenario.delta_time,
+        profile=True,
+        seed=scenario.seed,
+        collision_backend=scenario.collision_backend,
+    )
+    game.player.location = XYFloat.from_tuple(scenario.player_location)
+
+    # The scenario has to survive every frame and never open the level up menu
+    game.player.health = float("inf")
+    game.player.next_level_experience = 2 ** 62
+
+    for _ in range(scenario.weapons):
+        game.player.weapon_slots.append(Pistol(cooldown=scenario.weapon_cooldown))
+
+    spawn_time = scenario.enemies * 10 / 30
+    game.total_time = spawn_time
+    game.create_enemies()
+    game.camera.zoom = scenario.zoom
+    return game, spawn_time
+
+
+def run_scenario(scenario: Scenario) -> ScenarioResult:
+    game, spawn_time = load_scenario(scenario)
+
+    frame_times: list[float] = []
+    pair_tests: list[int] = []
+    cell_sizes: list[int] = []
+    phase_times: dict[str, list[float]] = {phase: [] for phase in PHASES}
+    for frame in range(scenario.warmup_frames + scenario.frames):
+        # Keep the horde at a constant size by replacing the kills
+        game.total_time = spawn_time
+        fire_projectiles(game, scenario.projectiles)
+
+        game.run_frame()
+
+        if frame >= scenario.warmup_frames:
+            record = game.profiler.frames[-1]
+            frame_times.append((record.end - record.start) / 1e9)
+            pair_tests.append(game.collision_system.stats['pair_tests'])
+            cell_sizes.append(game.collision_system.spatial_grid.cell_size)
+            totals = game.profiler.last_frame_totals()
+            for phase, samples in phase_times.items():
+                samples.append(totals.get(phase, 0.0))
+
+    return ScenarioResult(
+        scenario=scenario,
+        frame=summarise(frame_times),
+        phases={phase: summarise(samples) for phase, samples in phase_times.items()},
+        pair_tests=sum(pair_tests) / len(pair_tests) if pair_tests else 0.0,
+        cell_size=sum(cell_sizes) / len(cell_sizes) if cell_sizes else 0.0,
+    )
+
+
+def build_scenarios(arguments: argparse.Namespace) -> list[Scenario]:
+    return [
+        Scenario(
+            name=f"enemies_{enemies}",
+            enemies=enemies,
+            projectiles=(
+                arguments.projectiles if arguments.projectiles is not None else enemies // 10
+            ),
+            weapons=arguments.weapons,
+            weapon_cooldown=arguments.weapon_cooldown,
+            seed=arguments.seed,
+            frames=arguments.frames,
+            warmup_frames=arguments.warmup,
+            collision_backend=arguments.collision_backend,
+            zoom=arguments.zoom,
+        )
+        for enemies in arguments.enemies
+    ]
+
+
+def write_json(results: list[ScenarioResult], path: str):
+    output = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "scenarios": [
+            {
+                **asdict(result.scenario),
+                "frame": result.frame,
+                "phases": result.phases,
+                "pair_tests": result.pair_tests,
+                "cell_size": result.cell_size,
+            }
+            for result in results
+        ],
+    }
+    with open(path, "w") as file:
+        json.dump(output, file, indent=2)
+
+
+def write_csv(results: list[ScenarioResult], path: str):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        columns = list(results[0].frame.keys()) if results else []
+        writer.writerow(["scenario", "enemies", "projectiles", "weapons", "phase", *columns])
+        for result in results:
+            scenario = result.scenario
+            rows = [("frame", result.frame), *result.phases.items()]
+            for phase, summary in rows:
+                writer.writerow(
+                    [scenario.name, scenario.enemies, scenario.projectiles, scenario.weapons, phase]
+                    + [f"{summary[column]:.4f}" for column in columns]
+                )
+
+
+def print_results(results: list[ScenarioResult]):
+    for result in results:
+        scenario = result.scenario
+        print(
+            f"{scenario.name:<16}|\tEnemies: {scenario.enemies:<6}|\tProjectiles: {scenario.projectiles:<5}|\t"
+            f"p50: {result.frame['p50_ms']:8.2f}ms\t|\tp99: {result.frame['p99_ms']:8.2f}ms\t|\t"
+            f"{scenario.collision_backend} pair tests: {result.pair_tests:.0f}\t|\tCell size: {result.cell_size:.0f}"
+        )
+        for phase, summary in result.phases.items():
+            print(f"\t{phase:<32}p50: {summary['p50_ms']:8.3f}ms\t|\tp99: {summary['p99_ms']:8.3f}ms")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scenario benchmarks for Python Survivors")
+    parser.add_argument("--enemies", type=int, nargs="+", default=list(DEFAULT_ENEMY_COUNTS))
+    parser.add_argument("--projectiles", type=int, default=None, help="Live projectiles, defaults to enemies / 10")
+    parser.add_argument("--weapons", type=int, default=1)
+    parser.add_argument("--weapon-cooldown", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--collision-backend", choices=HighPerformanceCollisionSystem.BACKENDS, default="numpy"
+    )
+    parser.add_argument("--zoom", type=float, default=1.0, help="Camera zoom, above 1 most of the horde is culled")
+    parser.add_argument("--json", dest="json_path", default=None)
+    parser.add_argument("--csv", dest="csv_path", default=None)
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+
+    pygame.init()
+    pygame.font.init()
+    ic.disable()
+
+    results = [run_scenario(scenario) for scenario in build_scenarios(arguments)]
+
+    print_results(results)
+    if arguments.json_path:
+        write_json(results, arguments.json_path)
+    if arguments.csv_path:
+        write_csv(results, arguments.csv_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,8 @@ import random
 from scripts.readable_classes import XYFloat, XYInt
 from scripts.pygame_utils import create_surface, default_font, surface_to_file
 from pygame import Surface, FRect
-from pygame.transform import flip
 from scripts.config import BASE_SPEED
+from scripts.file_handler import ASSETS
 from typing import TYPE_CHECKING
 from icecream import ic
 
@@ -24,6 +24,8 @@ class BaseEntity:
             self.location = location
         else:
             self.location = XYFloat(0, 0)
+        # Location at the previous simulation tick, used to interpolate rendering between ticks
+        self.previous_location = self.location
 
         if surface:
             self.surface = surface
@@ -81,12 +83,14 @@ class BaseSprite(BaseEntity):
     def __eq__(self, other):
         return id(self) == id(other)
 
-    def __getattribute__(self, item: str):
-        if item != "surface":
-            return super().__getattribute__(item)
-        if self.flip_surface:
-            return flip(super().__getattribute__(item), True, False)
-        return super().__getattribute__(item)
+    @property
+    def surface(self) -> Surface:
+        return self.orientations[self.flip_surface]
+
+    @surface.setter
+    def surface(self, surface: Surface):
+        # The unflipped and flipped surface, shared by every sprite using the same source surface
+        self.orientations: tuple[Surface, Surface] = ASSETS.orientations(surface)
 
 
 class BaseDrop(BaseEntity):
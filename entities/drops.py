@@ -1,7 +1,8 @@
 from entities.base_entity import BaseDrop
-from pygame import Surface, image
-from random import choice
+from pygame import Surface
+from random import choice, Random
 from scripts.readable_classes import XYFloat
+from scripts.file_handler import ASSETS
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -10,7 +11,7 @@ if TYPE_CHECKING:
 
 class Money(BaseDrop):
     def __init__(self, location: XYFloat):
-        surface: Surface = image.load("assets/money.png")
+        surface: Surface = ASSETS.image("money.png")
         super().__init__(surface, location)
 
     def pickup(self, player: "Player"):
@@ -19,7 +20,7 @@ class Money(BaseDrop):
 
 class MoneyPile(BaseDrop):
     def __init__(self, location: XYFloat):
-        surface: Surface = image.load("assets/money_pile.png")
+        surface: Surface = ASSETS.image("money_pile.png")
         super().__init__(surface, location)
 
     def pickup(self, player: "Player"):
@@ -28,7 +29,7 @@ class MoneyPile(BaseDrop):
 
 class Experience(BaseDrop):
     def __init__(self, location: XYFloat):
-        surface: Surface = image.load("assets/experience.png")
+        surface: Surface = ASSETS.image("experience.png")
         super().__init__(surface, location)
 
     def pickup(self, player: "Player"):
@@ -37,7 +38,7 @@ class Experience(BaseDrop):
 
 class ExperiencePile(BaseDrop):
     def __init__(self, location: XYFloat):
-        surface: Surface = image.load("assets/experience_pile.png")
+        surface: Surface = ASSETS.image("experience_pile.png")
         super().__init__(surface, location)
 
     def pickup(self, player: "Player"):
@@ -53,7 +54,7 @@ DEFAULT_DROP_TABLE: dict[type[BaseDrop], int] = {
 }
 
 
-def get_drop(drop_table: dict = None) -> type[BaseDrop] | None:
+def get_drop(drop_table: dict = None, rng: Random = None) -> type[BaseDrop] | None:
     if drop_table is None:
         drop_table = DEFAULT_DROP_TABLE
 
@@ -61,4 +62,6 @@ def get_drop(drop_table: dict = None) -> type[BaseDrop] | None:
     for drop, weight in drop_table.items():
         for count in range(weight):
             items.append(drop)
+    if rng is not None:
+        return rng.choice(items)
     return choice(items)
@@ -1,9 +1,15 @@
 from scripts.readable_classes import XYFloat, XYInt
 from entities.base_entity import BaseSprite
 from entities.drops import DEFAULT_DROP_TABLE, get_drop
-from pygame import Surface, image
+from pygame import Surface, FRect
+from random import Random
 from scripts.pygame_utils import create_surface
 from scripts.config import BASE_SPEED
+from scripts.file_handler import ASSETS
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entities.enemy_store import EnemyStore
 
 
 class Enemy(BaseSprite):
@@ -14,11 +20,15 @@ class Enemy(BaseSprite):
         speed: float = None,
         health: float = None,
         drop_table: dict = None,
+        rng: Random = None,
     ):
+        # Once added to an EnemyStore the enemy is a view into the store's arrays
+        self.store: "EnemyStore | None" = None
+        self.index: int = -1
 
         if surface is None:
             # surface = create_surface(colour=(255, 0, 0), size=XYInt(20, 20))
-            surface = image.load("assets/enemy.png")
+            surface = ASSETS.image("enemy.png")
 
         if speed is None:
             speed = 0.6 * BASE_SPEED
@@ -29,8 +39,92 @@ class Enemy(BaseSprite):
         super().__init__(location, surface, speed, health)
 
         self.drop_table = drop_table
+        self.rng = rng
+
+    def attach(self, store: "EnemyStore", index: int):
+        self.store = store
+        self.index = index
+
+    def detach(self):
+        """Copy the state out of the store so the enemy keeps working after being removed from it"""
+        location, previous_location = self.location, self.previous_location
+        speed, health, flip_surface = self.speed, self.health, self.flip_surface
+        self.store = None
+        self.index = -1
+        self.location, self.previous_location = location, previous_location
+        self.speed, self.health, self.flip_surface = speed, health, flip_surface
+
+    @property
+    def location(self) -> XYFloat:
+        if self.store is None:
+            return self._location
+        return XYFloat.from_tuple(self.store.locations[self.index].tolist())
+
+    @location.setter
+    def location(self, value: XYFloat):
+        if self.store is None:
+            self._location = value
+        else:
+            self.store.locations[self.index] = value.to_tuple()
+
+    @property
+    def previous_location(self) -> XYFloat:
+        if self.store is None:
+            return self._previous_location
+        return XYFloat.from_tuple(self.store.previous_locations[self.index].tolist())
+
+    @previous_location.setter
+    def previous_location(self, value: XYFloat):
+        if self.store is None:
+            self._previous_location = value
+        else:
+            self.store.previous_locations[self.index] = value.to_tuple()
+
+    @property
+    def speed(self) -> float:
+        if self.store is None:
+            return self._speed
+        return float(self.store.speeds[self.index])
+
+    @speed.setter
+    def speed(self, value: float):
+        if self.store is None:
+            self._speed = value
+        else:
+            self.store.speeds[self.index] = value
+
+    @property
+    def health(self) -> float:
+        if self.store is None:
+            return self._health
+        return float(self.store.healths[self.index])
+
+    @health.setter
+    def health(self, value: float):
+        if self.store is None:
+            self._health = value
+        else:
+            self.store.healths[self.index] = value
+
+    @property
+    def flip_surface(self) -> bool:
+        if self.store is None:
+            return self._flip_surface
+        return bool(self.store.flipped[self.index])
+
+    @flip_surface.setter
+    def flip_surface(self, value: bool):
+        if self.store is None:
+            self._flip_surface = value
+        else:
+            self.store.flipped[self.index] = value
+
+    def get_rect(self) -> FRect:
+        if self.store is None:
+            return super().get_rect()
+        return FRect(self.store.locations[self.index].tolist(), self.store.sizes[self.index].tolist())
 
     def die(self):
-        if drop := get_drop(self.drop_table):
+        if drop := get_drop(self.drop_table, self.rng):
             return drop(self.location_center)
         return None
@@ -0,0 +1,144 @@
+from typing import TYPE_CHECKING, Callable, Iterator
+
+import numpy as np
+from pygame import FRect
+
+from scripts.readable_classes import XYFloat
+
+if TYPE_CHECKING:
+    from entities.enemy import Enemy
+
+# Cell of an enemy that has not been added to a spatial grid yet
+NO_CELL: int = np.iinfo(np.int64).min
+
+
+class EnemyStore:
+    """
+    Structure of arrays holding the state of every live enemy in contiguous NumPy arrays
+
+    Enemy objects become thin views into the arrays once appended, so code that works on a single enemy keeps
+    working while movement, flipping and contact checks run as one batched operation over the whole horde.
+    Behaves like the list of enemies it replaces: iteration, len, in, append and remove.
+    Removal swaps the last enemy into the freed slot, so the order of enemies is not preserved.
+    """
+
+    COLUMNS: tuple[str, ...] = ("locations", "previous_locations", "speeds", "healths", "flipped", "sizes", "cells")
+
+    def __init__(self, capacity: int = 1024):
+        self.count: int = 0
+        self.enemies: list["Enemy"] = []
+
+        self.locations: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        self.previous_locations: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        self.speeds: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        self.healths: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        self.flipped: np.ndarray = np.zeros(capacity, dtype=np.bool_)
+        self.sizes: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        # Spatial grid cell each enemy is currently binned in, maintained by an incremental SpatialGrid
+        self.cells: np.ndarray = np.full((capacity, 2), NO_CELL, dtype=np.int64)
+
+        # Called with every enemy right before it is removed
+        self.remove_listeners: list[Callable[["Enemy"], None]] = []
+
+    @property
+    def capacity(self) -> int:
+        return len(self.speeds)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator["Enemy"]:
+        return iter(self.enemies)
+
+    def __getitem__(self, index: int) -> "Enemy":
+        return self.enemies[index]
+
+    def __contains__(self, enemy: "Enemy") -> bool:
+        return getattr(enemy, "store", None) is self
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name in self.COLUMNS:
+            column: np.ndarray = getattr(self, name)
+            grown = np.zeros((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[: self.count] = column[: self.count]
+            setattr(self, name, grown)
+
+    def append(self, enemy: "Enemy"):
+        if self.count == self.capacity:
+            self._grow()
+
+        index = self.count
+        self.locations[index] = enemy.location.to_tuple()
+        self.previous_locations[index] = enemy.previous_location.to_tuple()
+        self.speeds[index] = enemy.speed
+        self.healths[index] = enemy.health
+        self.flipped[index] = enemy.flip_surface
+        self.sizes[index] = enemy.surface.get_size()
+        self.cells[index] = NO_CELL
+
+        self.enemies.append(enemy)
+        self.count += 1
+        enemy.attach(self, index)
+
+    def remove(self, enemy: "Enemy"):
+        if enemy not in self:
+            raise ValueError("Enemy is not in this store")
+
+        for listener in self.remove_listeners:
+            listener(enemy)
+
+        index = enemy.index
+        last = self.count - 1
+        enemy.detach()
+
+        # Move the last enemy into the freed slot
+        if index != last:
+            for name in self.COLUMNS:
+                column: np.ndarray = getattr(self, name)
+                column[index] = column[last]
+            moved = self.enemies[last]
+            self.enemies[index] = moved
+            moved.index = index
+
+        self.enemies.pop()
+        self.count -= 1
+
+    def move_towards(self, target: XYFloat, delta_time: float):
+        """Move every enemy towards the target like calculate_pathing and face them in their direction of travel"""
+        count = self.count
+        locations = self.locations[:count]
+        self.previous_locations[:count] = locations
+
+        offsets = np.array(target.to_tuple()) - locations
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        steps = self.speeds[:count] * delta_time
+
+        # Enemies within a step of the target land exactly on it
+        scales = np.where(distances <= steps, 1.0, steps / np.maximum(distances, 1e-12))
+        new_locations = locations + offsets * scales[:, None]
+
+        self.flipped[:count] = locations[:, 0] < new_locations[:, 0]
+        locations[:] = new_locations
+
+    def count_colliding(self, rect: FRect) -> int:
+        """:return: The amount of enemies overlapping the rect, matching FRect.colliderect"""
+        count = self.count
+        locations = self.locations[:count]
+        sizes = self.sizes[:count]
+        overlapping = (
+            (locations[:, 0] < rect.right)
+            & (locations[:, 0] + sizes[:, 0] > rect.left)
+            & (locations[:, 1] < rect.bottom)
+            & (locations[:, 1] + sizes[:, 1] > rect.top)
+        )
+        return int(np.count_nonzero(overlapping))
+
+    def interpolated(self, alpha: float) -> np.ndarray:
+        """:return: The location of every enemy between its last two ticks"""
+        count = self.count
+        previous = self.previous_locations[:count]
+        return previous + (self.locations[:count] - previous) * alpha
+
+    def interpolated_locations(self, alpha: float) -> list[list[float]]:
+        return self.interpolated(alpha).tolist()
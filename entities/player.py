@@ -1,7 +1,8 @@
 from scripts.readable_classes import XYFloat
 from entities.base_entity import BaseSprite
-from pygame import Surface, image
+from pygame import Surface
 from weapons.base_weapon import BaseWeapon
+from scripts.file_handler import ASSETS
 
 
 class Player(BaseSprite):
@@ -13,7 +14,7 @@ class Player(BaseSprite):
         health: int = 1,
     ):
         if surface is None:
-            surface = image.load("assets/player.png")
+            surface = ASSETS.image("player.png")
         super().__init__(location, surface, speed, health)
 
         self.weapon_slots: list[BaseWeapon] = []
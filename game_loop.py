@@ -1,11 +1,9 @@
-from functools import lru_cache
-
 import pygame
 import sys
 import time
 import random
 
-from pygame import Surface, image, mouse
+from pygame import Surface, mouse
 
 from entities.base_entity import BaseDrop
 from scripts import (
@@ -13,29 +11,83 @@ from scripts import (
     config,
 )
 from entities import player, enemy
-from scripts.readable_classes import XYFloat
-from scripts.pygame_utils import calculate_pathing, tile_background, default_font, create_font_surface
+from entities.enemy_store import EnemyStore
+from scripts.readable_classes import XYFloat, XYInt, SimulationReport
+from scripts.pygame_utils import tile_background, default_font, interpolate
 from ui.overlay import Overlay
 from weapons.weapons import Pistol
 from weapons.base_weapon import BaseEffect
-from scripts.collision_system import HighPerformanceCollisionSystem, WeaponCollisionHelper
+from scripts.collision_system import HighPerformanceCollisionSystem
+from scripts.projectile_system import ProjectileSystem
+from scripts.damage_numbers import DamageNumbers
+from scripts.profiler import FrameProfiler
+from scripts.file_handler import ASSETS
+from scripts.text_renderer import TEXT
+from scripts.cache import CACHES
+from scripts.camera import Camera
+from scripts.renderer import RenderQueue, LAYER_DROPS, LAYER_ENEMIES, LAYER_PLAYER
+from scripts.input_recording import InputRecording, InputReplay
+from icecream import ic
 
 
 class Game:
-    def __init__(self):
+    def __init__(
+        self,
+        headless: bool = False,
+        fixed_delta_time: float = None,
+        profile: bool = False,
+        seed: int = None,
+        record_path: str = None,
+        replay: InputRecording = None,
+        tick_rate: int = config.TICK_RATE,
+        collision_backend: str = "numpy",
+    ):
+        # The simulation always advances in fixed ticks, rendering interpolates between the last two of them
+        self.tick_rate: int = tick_rate
+        self.delta_time: float = 1 / tick_rate
+        self.accumulator: float = 0
+        self.frame_time: float = 0
+
+        # Headless games never open a window and are driven by a fixed frame time
+        self.headless: bool = headless
+        if self.headless and fixed_delta_time is None:
+            fixed_delta_time = self.delta_time
+        self.fixed_delta_time: float | None = fixed_delta_time
+
+        # Every random decision of a game comes from its own generator so a seed reproduces the whole run
+        if replay is not None:
+            seed = replay.seed
+        elif seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed: int = seed
+        self.rng: random.Random = random.Random(seed)
+
+        # Input recording and replay
+        self.record_path: str | None = record_path
+        self.recording: InputRecording | None = InputRecording(seed, headless) if record_path else None
+        self.replay: InputReplay | None = InputReplay(replay) if replay is not None else None
+
+        # Without a mouse the level up rewards are picked automatically, replays repeat how they were recorded
+        self.auto_level_up: bool = replay.headless if replay is not None else headless
+
         # Display window
-        self.game_screen: pygame.display = pygame.display.set_mode(
-            (config.WINDOW_SIZE.x, config.WINDOW_SIZE.y)
-        )
+        self.game_screen: pygame.display | None = None
+        if not self.headless:
+            self.game_screen = pygame.display.set_mode(
+                (config.WINDOW_SIZE.x, config.WINDOW_SIZE.y)
+            )
+
+            # Window name
+            pygame.display.set_caption("Python Survivors")
+
+            # Shared sprites can be converted to the display's pixel format now that it exists
+            ASSETS.convert()
 
         # Smaller resolution display that will be up scaled to our window
         self.game_display: pygame.surface = pygame.Surface(
             (config.DISPLAY_SIZE.x, config.DISPLAY_SIZE.y)
         )
 
-        # Window name
-        pygame.display.set_caption("Python Survivors")
-
         # Player inputs
         self.player_input: readable_classes.DirectionBool = (
             readable_classes.DirectionBool(False, False, False, False)
@@ -49,12 +101,13 @@ class Game:
         self.player = player.Player(
             location=self.get_screen_center(),
         )
-        self.enemies: list[enemy.Enemy] = []
+        self.enemies: EnemyStore = EnemyStore()
         self.drops: list[BaseDrop] = []
+        # How many drops are in the collision system's drop grid
+        self.indexed_drops: int = 0
 
-        # Camera
-        self.scroll: readable_classes.XYFloat = readable_classes.XYFloat(0, 0)
-        self.zoom: float = 2.0
+        # Camera, follows the player and starts with the player in the middle of the view
+        self.camera: Camera = Camera(config.DISPLAY_SIZE, self.player.location)
 
         # Tile Map
         self.level = 0
@@ -63,55 +116,121 @@ class Game:
         self.clock: pygame.time.Clock = pygame.time.Clock()
         self.framerate: int = 240
         self.last_time: float = time.time()
-        self.delta_time: float = time.time()
         self.total_time: float = 0
-        self.framerate_font = default_font(40)
 
         self.paused = False
-        self.overlay: Overlay = Overlay(self.game_display, self.player, self.paused)
+        self.overlay: Overlay = Overlay(self.game_display, self.player, self.paused, self.rng)
 
         # Initialize collision system
-        self.collision_system = HighPerformanceCollisionSystem(cell_size=64)
-        self.weapon_collision_helper = WeaponCollisionHelper()
-        self.weapon_collision_helper.set_collision_system(self.collision_system)
+        self.collision_system = HighPerformanceCollisionSystem(
+            cell_size=64,
+            incremental=True,
+            backend=collision_backend,
+            bounded=False,
+            adaptive=True,
+        )
+
+        # Damage of every hit, drawn from a pre-rendered digit atlas
+        self.damage_numbers: DamageNumbers = DamageNumbers()
+
+        # Every live projectile of every weapon, collision checked together once per tick
+        self.projectile_system: ProjectileSystem = ProjectileSystem(self.damage_numbers)
+
+        # Every sprite of the world is drawn through the render queue
+        self.render_queue: RenderQueue = RenderQueue()
 
         # Debug display
         self.debug_font = default_font(20)
         self.show_debug = False
 
+        # Per frame profiler, always recording when profiling was requested otherwise only while debugging
+        self.profile: bool = profile
+        self.profiler: FrameProfiler = FrameProfiler(enabled=profile)
+
     def load_level(self):
         ...
 
     def display_framerate(self):
-        rate_text = self.framerate_font.render(
-            str(round(self.clock.get_fps(), 2)), True, (0, 0, 0)
-        )
-        self.game_display.blit(rate_text, (0, 0))
+        TEXT.draw(self.game_display, str(round(self.clock.get_fps(), 2)), (0, 0), (0, 0, 0), 40)
 
     def display_debug_info(self):
-        """Display collision system debug information"""
+        """Display collision system debug information and the frame time graph"""
         if self.show_debug:
-            debug_text = create_font_surface(self.collision_system.get_debug_info(), (255, 0, 0), 40)
-            self.game_display.blit(debug_text, (0, 50))
+            _, debug_height = TEXT.draw(
+                self.game_display,
+                f"{self.collision_system.get_debug_info()}\n"
+                f"{self.projectile_system.get_debug_info()}\n"
+                f"{self.damage_numbers.get_debug_info()}\n"
+                f"{self.render_queue.get_debug_info()}\n"
+                f"{ASSETS.get_debug_info()}",
+                (0, 50),
+                (255, 0, 0),
+                40,
+            )
+            self.profiler.draw_graph(self.game_display, (0, 50 + debug_height))
+            # Too many lines for the column on the left, which must leave room for the graph
+            TEXT.draw(
+                self.game_display,
+                f"{self.camera.get_debug_info()}\n{CACHES.get_debug_info()}",
+                (config.DISPLAY_SIZE.x * 0.6, 50),
+                (255, 0, 0),
+                30,
+            )
+
+    def export_trace(self, path: str = None) -> str:
+        """Dump the recorded frames as a Chrome trace that Perfetto can load"""
+        if path is None:
+            path = f"logs/trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        self.profiler.export_trace(path)
+        return path
 
     def calculate_delta_time(self):
-        now = time.time()
-        self.delta_time = now - self.last_time
-        self.last_time = now
-        if not self.paused:
-            self.total_time += self.delta_time
+        """Measure how long the last frame took, the simulation itself always advances by self.delta_time"""
+        if self.replay is not None:
+            self.frame_time = self.replay.next_delta_time()
+        elif self.fixed_delta_time is not None:
+            self.frame_time = self.fixed_delta_time
+        else:
+            now = time.time()
+            self.frame_time = now - self.last_time
+            self.last_time = now
+
+        if self.recording is not None:
+            self.recording.record_delta_time(self.frame_time)
 
     def get_screen_center(self) -> XYFloat:
         return XYFloat(
             self.game_display.get_width() / 2, self.game_display.get_height() / 2
         )
 
+    def save_recording(self):
+        if self.recording is not None:
+            self.recording.save(self.record_path)
+
+    def quit(self):
+        self.save_recording()
+        if self.replay is not None:
+            self.replay.stop()
+            return
+        pygame.quit()
+        sys.exit()
+
     def get_user_input(self):
-        for event in pygame.event.get():
+        if self.replay is not None:
+            # A replay ignores live input, but a window still has to handle its events to keep responding
+            if not self.headless and any(event.type == pygame.QUIT for event in pygame.event.get()):
+                self.quit()
+            events, mouse_position = self.replay.next_input()
+        else:
+            events, mouse_position = pygame.event.get(), mouse.get_pos()
+
+        if self.recording is not None:
+            self.recording.record_input(events, mouse_position)
+
+        for event in events:
             match event.type:
                 case pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
 
                 # Click
                 case pygame.MOUSEBUTTONDOWN:
@@ -146,6 +265,9 @@ class Game:
                             )
                         case pygame.K_F3:  # Toggle debug display
                             self.show_debug = not self.show_debug
+                            self.profiler.enabled = self.show_debug or self.profile
+                        case pygame.K_F4:  # Export the recorded frames
+                            ic(f"Trace exported to {self.export_trace()}")
                         case pygame.K_ESCAPE:
                             self.paused = not self.paused
 
@@ -161,7 +283,7 @@ class Game:
                         case pygame.K_DOWN | pygame.K_s:
                             self.player_input.down = False
 
-        self.player_mouse.mouse_position = XYFloat.from_tuple(mouse.get_pos())
+        self.player_mouse.mouse_position = XYFloat.from_tuple(mouse_position)
 
     def draw_screen(self):
         self.game_screen.blit(
@@ -182,37 +304,32 @@ class Game:
             self.player.location.y += self.player.speed * self.delta_time
 
     def update_enemies(self):
-        for enemy_character in self.enemies:
-            new_location = calculate_pathing(
-                enemy_character.location,
-                self.player.location,
-                enemy_character.speed,
-                self.delta_time,
-            )
-
-            if enemy_character.location.x < new_location.x:
-                enemy_character.flip_surface = True
-            else:
-                enemy_character.flip_surface = False
+        # The whole horde moves in one batch
+        self.enemies.move_towards(self.player.location, self.delta_time)
 
-            enemy_character.location = new_location
-
-            if enemy_character.get_rect().colliderect(self.player.get_rect()):
-                self.player.health -= 1
+    def update_contact_damage(self):
+        self.player.health -= len(self.collision_system.query_rect(self.player.get_rect()))
 
     def update_drops(self):
-        for drop in self.drops.copy():
-            if drop.get_rect().colliderect(self.player.get_rect()):
-                drop.pickup(self.player)
-                self.drops.remove(drop)
-                continue
+        # Drops are only ever appended, so the ones past the indexed count were dropped since the last tick
+        for drop in self.drops[self.indexed_drops:]:
+            self.collision_system.add_drop(drop)
+
+        for drop in self.collision_system.query_drops(self.player.get_rect()):
+            drop.pickup(self.player)
+            self.drops.remove(drop)
+            self.collision_system.remove_drop(drop)
+        self.indexed_drops = len(self.drops)
 
     def create_enemies(self):
         safe_area = 200
+        # Enemies spawn in a display sized area around the player, which is the view when not zoomed
+        left = self.player.location.x - config.DISPLAY_SIZE.x // 2
+        top = self.player.location.y - config.DISPLAY_SIZE.y // 2
         while len(self.enemies) < 30 * self.total_time / 10:
             while new_location := XYFloat(
-                random.randint(0, config.DISPLAY_SIZE.x),
-                random.randint(0, config.DISPLAY_SIZE.y),
+                left + self.rng.randint(0, config.DISPLAY_SIZE.x),
+                top + self.rng.randint(0, config.DISPLAY_SIZE.y),
             ):
                 if (
                     new_location.x < self.player.location.x - safe_area
@@ -222,75 +339,209 @@ class Game:
                     or new_location.y > self.player.location.y + safe_area
                 ):
                     break
-            self.enemies.append(enemy.Enemy(location=new_location, health=2))
+            self.enemies.append(enemy.Enemy(location=new_location, health=2, rng=self.rng))
 
-    @lru_cache
     def create_background(self) -> Surface:
+        """:return: The smallest seamless tile of the background, which the camera repeats over the display"""
+        brick = ASSETS.image("background_brick.png")
         return tile_background(
-            image.load("assets/background_brick.png"), alternate_rows=True
+            brick, alternate_rows=True, size=XYInt(brick.get_width(), brick.get_height() * 2)
         )
 
-    def draw_everything(self):
-        for drop in self.drops:
-            self.game_display.blit(drop.surface, drop.location.to_tuple())
-
-        for enemy_character in self.enemies:
-            self.game_display.blit(
-                enemy_character.surface, enemy_character.location.to_tuple()
-            )
-
-        # Clear the collision helper for this frame
-        self.weapon_collision_helper.clear_frame()
-
-        # Update all weapons and collect their ammo
+    def update_weapons(self):
+        # Weapons only fire, their projectiles all move and collide in the projectile system
         for weapon in self.player.weapon_slots:
-            weapon.update_with_collision_system(
-                self.delta_time if not self.paused else 0,
+            with self.profiler.scope(f"{weapon.__class__.__name__}.update_cooldown"):
+                weapon.update_cooldown(
+                    self.delta_time,
+                    self.player,
+                    self.enemies,
+                    self.projectile_system,
+                    self.collision_system,
+                )
+
+        with self.profiler.scope("projectile_system.update"):
+            self.projectile_system.update(
+                self.delta_time,
                 self.player,
                 self.enemies,
-                self.game_display,
                 self.drops,
-                self.weapon_collision_helper,
+                self.collision_system,
             )
 
-        self.game_display.blit(self.player.surface, self.player.location.to_tuple())
+    def draw_everything(self, alpha: float):
+        """
+        Draw the current state of the game
+        :param alpha: How far the frame is between the previous tick and the current one
+        """
+        camera = self.camera
+        camera.reset_stats()
+
+        # Drops dropped this tick are not in the drop grid yet
+        self.render_queue.submit_many(
+            (
+                (camera.scaled(drop.surface), camera.world_to_screen(drop.location.to_tuple()))
+                for drop in (*self.collision_system.query_drops(camera.view_rect()), *self.drops[self.indexed_drops:])
+                if camera.is_visible(drop.location.to_tuple(), drop.surface.get_size())
+            ),
+            LAYER_DROPS,
+        )
 
-        self.paused = self.overlay.update(self.paused, self.total_time, self.player.kills, self.player_mouse)
+        locations = self.enemies.interpolated(alpha)
+        visible = camera.cull(locations, self.enemies.sizes[:len(self.enemies)])
+        enemies = self.enemies.enemies
+        surfaces = [
+            enemies[index].orientations[flipped]
+            for index, flipped in zip(visible.tolist(), self.enemies.flipped[visible].tolist())
+        ]
+        self.render_queue.submit_many(
+            zip(camera.scaled_all(surfaces), camera.to_screen(locations[visible]).tolist()),
+            LAYER_ENEMIES,
+        )
 
-    def run(self):
-        self.player.weapon_slots.append(Pistol())
+        self.projectile_system.draw(self.render_queue, alpha, camera)
+        self.damage_numbers.draw(self.render_queue, self.frame_time if not self.paused else 0, camera)
 
-        while True:
-            self.create_enemies()
+        self.render_queue.submit(
+            camera.scaled(self.player.surface),
+            camera.world_to_screen(interpolate(self.player.previous_location, self.player.location, alpha)),
+            LAYER_PLAYER,
+        )
+
+        with self.profiler.scope("render_queue.flush"):
+            self.render_queue.flush(self.game_display)
 
+        with self.profiler.scope("overlay.update"):
+            self.paused = self.overlay.update(self.paused, self.total_time, self.player.kills, self.player_mouse)
+
+    def choose_level_option(self):
+        """Games without a mouse always pick the first level up reward"""
+        if self.overlay.level_menu is None:
+            return
+        self.overlay.level_menu.choose(self.overlay.level_menu.layers[0])
+
+    def simulate_tick(self):
+        """Advance the game by exactly one tick of self.delta_time seconds"""
+        with self.profiler.scope("create_enemies"):
+            self.create_enemies()
+        with self.profiler.scope("update_enemies"):
+            self.update_enemies()
+
+        # Update collision system with the enemies where they are now, everything below queries it
+        with self.profiler.scope("collision_system.update_enemies"):
+            self.collision_system.update_enemies(self.enemies)
+
+        # Update all entities
+        with self.profiler.scope("update_contact_damage"):
+            self.update_contact_damage()
+        with self.profiler.scope("update_drops"):
+            self.update_drops()
+        with self.profiler.scope("update_player"):
+            self.player.previous_location = self.player.location.copy()
+            self.update_player()
+        with self.profiler.scope("update_weapons"):
+            self.update_weapons()
+
+        self.total_time += self.delta_time
+
+    def simulate(self):
+        """Run as many ticks as the time that passed allows, stopping early for a level up or death"""
+        if self.paused:
+            return
+
+        self.accumulator += min(self.frame_time, config.MAX_FRAME_TIME)
+        while (
+            self.accumulator >= self.delta_time
+            and self.player.health > 0
+            and not self.player.recently_leveled_up
+        ):
+            self.simulate_tick()
+            self.accumulator -= self.delta_time
+
+    def run_frame(self) -> bool:
+        """
+        Run a single frame of the game, which simulates zero or more ticks and renders once
+        :return: If the player is still alive
+        """
+        if self.replay is not None and self.replay.finished:
+            return False
+
+        with self.profiler.frame():
             self.calculate_delta_time()
 
-            # Clear the screen
-            self.game_display.fill((255, 255, 255))
-            self.game_display.blit(
-                self.create_background(),
-                (0, 0),
-            )
+            # Get player input, replays drive headless games as well
+            if not self.headless or self.replay is not None:
+                with self.profiler.scope("get_user_input"):
+                    self.previous_player_input = self.player_input.copy()
+                    self.get_user_input()
 
-            # Get player input
-            self.previous_player_input = self.player_input.copy()
-            self.get_user_input()
+            self.simulate()
+            if self.player.health <= 0:
+                return False
 
-            if not self.paused:
-                # Update collision system with current enemies
-                self.collision_system.update_enemies(self.enemies)
+            if self.headless:
+                with self.profiler.scope("overlay.update"):
+                    self.paused = self.overlay.update_state(self.paused, self.player_mouse)
+                if self.auto_level_up:
+                    self.choose_level_option()
+                return True
 
-                # Update all entities
-                self.update_drops()
-                self.update_enemies()
-                self.update_player()
+            # How far the frame is between the previous tick and the current one, ticks stopped early for a level up
+            # leave more than a tick in the accumulator which must not extrapolate past the current tick
+            alpha = min(self.accumulator / self.delta_time, 1.0)
+            self.camera.follow(interpolate(self.player.previous_location, self.player.location, alpha))
+
+            # Clear the screen
+            with self.profiler.scope("clear_screen"):
+                self.game_display.fill((255, 255, 255))
+                self.camera.draw_background(self.game_display, self.create_background())
 
             # Draw everything
-            self.draw_everything()
-            if self.player.health <= 0:
+            with self.profiler.scope("draw_everything"):
+                self.draw_everything(alpha)
+
+            if self.auto_level_up:
+                self.choose_level_option()
+
+            with self.profiler.scope("display_debug_info"):
+                self.display_framerate()
+                self.display_debug_info()
+            with self.profiler.scope("draw_screen"):
+                self.draw_screen()
+        return True
+
+    def run(self):
+        self.player.weapon_slots.append(Pistol())
+
+        while self.run_frame():
+            self.clock.tick(self.framerate)
+
+        self.save_recording()
+
+    def run_headless(self, frames: int = None, seconds: float = None) -> SimulationReport:
+        """
+        Simulate the game without a window until the player dies or the limit is reached
+        :param frames: Maximum amount of frames to simulate
+        :param seconds: Maximum amount of in game seconds to simulate
+        :return: Statistics about the simulation
+        """
+        if frames is None and seconds is None and self.replay is None:
+            raise ValueError("A headless game needs a frame or second limit")
+
+        self.player.weapon_slots.append(Pistol())
+
+        frames_run = 0
+        start_time = time.perf_counter()
+        while (frames is None or frames_run < frames) and (seconds is None or self.total_time < seconds):
+            frames_run += 1
+            if not self.run_frame():
                 break
 
-            self.display_framerate()
-            self.display_debug_info()
-            self.draw_screen()
-            self.clock.tick(self.framerate)
\ No newline at end of file
+        self.save_recording()
+        return SimulationReport(
+            frames=frames_run,
+            simulated_time=self.total_time,
+            wall_time=time.perf_counter() - start_time,
+            kills=self.player.kills,
+            player_alive=self.player.health > 0,
+        )
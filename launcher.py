@@ -1,13 +1,81 @@
+import argparse
+
 import pygame
+from icecream import ic
+
 from game_loop import Game
 from scripts.pygame_utils import configure_icecream
+from scripts.input_recording import InputRecording
+from scripts.cache import CACHES
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Python Survivors")
+    parser.add_argument("--headless", action="store_true", help="Simulate the game without opening a window")
+    parser.add_argument("--frames", type=int, default=None, help="Frames to simulate per headless run")
+    parser.add_argument("--seconds", type=float, default=None, help="In game seconds to simulate per headless run")
+    parser.add_argument("--delta-time", type=float, default=1 / 60, help="Fixed delta time of a headless frame")
+    parser.add_argument("--runs", type=int, default=1, help="Amount of headless runs")
+    parser.add_argument("--profile", action="store_true", help="Record every frame, F4 exports a trace")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the game's random number generator")
+    parser.add_argument("--record", default=None, help="Record the seed, delta times and input to this file, {run} is replaced by the run number")
+    parser.add_argument("--replay", default=None, help="Replay a recording frame for frame")
+    parser.add_argument("--trace", default=None, help="Chrome trace written after each headless run, {run} is replaced by the run number")
+    arguments = parser.parse_args()
+    if arguments.record and arguments.runs > 1 and "{run}" not in arguments.record:
+        parser.error("--record needs {run} in the path to keep every run's recording")
+    return arguments
+
+
+def run_headless(arguments: argparse.Namespace):
+    # Logging every hit would dominate the simulation time
+    ic.disable()
+
+    replay = InputRecording.load(arguments.replay) if arguments.replay else None
+
+    seconds = arguments.seconds
+    if arguments.frames is None and seconds is None and replay is None:
+        seconds = 60
+
+    for run in range(arguments.runs):
+        # Every run starts from cold caches like a fresh game
+        CACHES.clear()
+        game = Game(
+            headless=True,
+            fixed_delta_time=arguments.delta_time,
+            profile=arguments.profile or arguments.trace is not None,
+            seed=arguments.seed,
+            record_path=arguments.record.format(run=run + 1) if arguments.record else None,
+            replay=replay,
+        )
+        report = game.run_headless(frames=arguments.frames, seconds=seconds)
+        print(f"Run: {run + 1}\t|\t{report}")
+        if arguments.trace:
+            print(f"Trace: {game.export_trace(arguments.trace.format(run=run + 1))}")
 
 
 if __name__ == "__main__":
+    arguments = parse_arguments()
+
     pygame.init()
     pygame.font.init()
     configure_icecream()
 
-    while True:
-        game = Game()
-        game.run()
+    if arguments.headless:
+        run_headless(arguments)
+    else:
+        replay = InputRecording.load(arguments.replay) if arguments.replay else None
+        run = 0
+        while True:
+            run += 1
+            # Nothing cached by the previous game outlives it
+            CACHES.clear()
+            game = Game(
+                profile=arguments.profile,
+                seed=arguments.seed,
+                record_path=arguments.record.format(run=run) if arguments.record else None,
+                replay=replay,
+            )
+            game.run()
+            if replay is not None:
+                break
@@ -0,0 +1,186 @@
+import weakref
+from functools import wraps
+from typing import Any, Callable, Hashable, Protocol
+
+from pygame import Surface
+
+
+def estimate_size(value: Any) -> int:
+    """:return: Rough bytes held by a cached value, counting the pixels of the surfaces in it"""
+    if isinstance(value, Surface):
+        return value.get_width() * value.get_height() * value.get_bytesize()
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    if isinstance(surface := getattr(value, "surface", None), Surface):
+        return estimate_size(surface)
+    return 0
+
+
+class Cache:
+    """
+    Least recently used cache bounded by both its entries and the bytes of what it holds
+
+    Entries are evicted from the least recently used end until both limits hold again, an entry bigger than the whole
+    byte budget is returned but never stored.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = None,
+        max_bytes: int = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        # Kept in least to most recently used order, with the bytes of every value
+        self.entries: dict[Hashable, tuple[Any, int]] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """:return: The cached value of the key, created and stored on a miss"""
+        if (entry := self.entries.pop(key, None)) is not None:
+            self.entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = create()
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return value
+
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while (self.max_entries is not None and len(self.entries) > self.max_entries) or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            self.discard(next(iter(self.entries)))
+            self.evictions += 1
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        if (entry := self.entries.pop(key, None)) is not None:
+            self.bytes -= entry[1]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_debug_info(self) -> str:
+        # The game font has no pipe
+        return (f"{self.name}: {len(self.entries)}, {self.hit_rate() * 100:.0f}% hits, "
+                f"{self.bytes / 1024:.0f}KB")
+
+
+class Flushable(Protocol):
+    """Anything holding cached data that the registry reports and flushes along with its own caches"""
+
+    name: str
+    bytes: int
+
+    def clear(self) -> None: ...
+
+    def get_debug_info(self) -> str: ...
+
+
+class CacheRegistry:
+    """Every cache of the game, so they can be inspected and flushed together"""
+
+    def __init__(self):
+        self.caches: dict[str, Flushable] = {}
+
+    def register(self, cache: Flushable) -> Flushable:
+        if cache.name in self.caches:
+            raise ValueError(f"Cache {cache.name} already exists")
+        self.caches[cache.name] = cache
+        return cache
+
+    def create(self, name: str, max_entries: int = None, max_bytes: int = None) -> Cache:
+        return self.register(Cache(name, max_entries, max_bytes))
+
+    def clear(self) -> None:
+        """Flush every cache, called when a new game starts"""
+        for cache in self.caches.values():
+            cache.clear()
+
+    def memory_usage(self) -> int:
+        return sum(cache.bytes for cache in self.caches.values())
+
+    def get_debug_info(self) -> str:
+        return "\n".join(
+            [f"Caches: {len(self.caches)}, {self.memory_usage() / 1024:.0f}KB"]
+            + [cache.get_debug_info() for cache in self.caches.values()]
+        )
+
+
+CACHES: CacheRegistry = CacheRegistry()
+
+
+def cached(name: str, max_entries: int = None, max_bytes: int = None) -> Callable[[Callable], Callable]:
+    """
+    Bounded replacement for functools.lru_cache whose cache is registered in CACHES
+    :param name: Name of the cache in the debug display
+    """
+
+    def decorator(function: Callable) -> Callable:
+        cache = CACHES.create(name, max_entries, max_bytes)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            return cache.get(key, lambda: function(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cached_method(name: str, max_entries: int = None, max_bytes: int = None) -> Callable[[Callable], Callable]:
+    """
+    Like cached for methods, without keeping the instances alive
+
+    Entries are keyed by the id of the instance and dropped once it is garbage collected, a value that references its
+    own instance does keep it alive.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        cache = CACHES.create(name, max_entries, max_bytes)
+        # Keys cached for every live instance, by the id of the instance
+        owned_keys: dict[int, set[Hashable]] = {}
+
+        def release(owner: int):
+            for key in owned_keys.pop(owner, ()):
+                cache.discard(key)
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            owner = id(self)
+            key = (owner, args, tuple(sorted(kwargs.items())))
+            if key not in cache:
+                if owner not in owned_keys:
+                    owned_keys[owner] = set()
+                    weakref.finalize(self, release, owner)
+                owned_keys[owner].add(key)
+            return cache.get(key, lambda: method(self, *args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
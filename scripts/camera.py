@@ -0,0 +1,118 @@
+import numpy as np
+from typing import Iterable
+
+from pygame import FRect, Surface
+
+from scripts.file_handler import ASSETS
+from scripts.readable_classes import XYFloat, XYInt
+
+
+class Camera:
+    """
+    View of the world that is drawn onto the game display
+
+    Entities live in world coordinates, the camera centres the view on its location and scales it by zoom to get
+    screen coordinates. Anything outside the view is culled before it is submitted to the render queue, so drawing
+    costs what is on screen rather than what exists.
+    """
+
+    def __init__(self, view_size: XYInt, location: XYFloat = None, zoom: float = 1.0):
+        self.view_size = view_size
+        self.zoom = zoom
+        # World position at the centre of the view
+        self.location: XYFloat = location.copy() if location is not None else XYFloat(view_size.x / 2, view_size.y / 2)
+        self.stats: dict[str, int] = {
+            'visible': 0,
+            'culled': 0,
+        }
+
+    @property
+    def world_size(self) -> tuple[float, float]:
+        """:return: Width and height of the world the view covers"""
+        return self.view_size.x / self.zoom, self.view_size.y / self.zoom
+
+    @property
+    def origin(self) -> tuple[float, float]:
+        """:return: The world position of the top left of the view"""
+        width, height = self.world_size
+        return self.location.x - width / 2, self.location.y - height / 2
+
+    def follow(self, target: tuple[float, float]) -> None:
+        self.location = XYFloat.from_tuple(target)
+
+    def view_rect(self) -> FRect:
+        """:return: The part of the world in view"""
+        return FRect(self.origin, self.world_size)
+
+    def world_to_screen(self, point: tuple[float, float]) -> tuple[float, float]:
+        left, top = self.origin
+        return (point[0] - left) * self.zoom, (point[1] - top) * self.zoom
+
+    def screen_to_world(self, point: tuple[float, float]) -> tuple[float, float]:
+        left, top = self.origin
+        return point[0] / self.zoom + left, point[1] / self.zoom + top
+
+    def to_screen(self, locations: np.ndarray) -> np.ndarray:
+        """:return: World locations, one row per point, in screen coordinates"""
+        return (locations - self.origin) * self.zoom
+
+    def cull(self, locations: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """:return: Indices of the rects, given by their top left and size in the world, that overlap the view"""
+        left, top = self.origin
+        width, height = self.world_size
+        visible = np.flatnonzero(
+            (locations[:, 0] < left + width)
+            & (locations[:, 0] + sizes[:, 0] > left)
+            & (locations[:, 1] < top + height)
+            & (locations[:, 1] + sizes[:, 1] > top)
+        )
+        self.stats['visible'] += len(visible)
+        self.stats['culled'] += len(locations) - len(visible)
+        return visible
+
+    def is_visible(self, location: tuple[float, float], size: tuple[float, float]) -> bool:
+        left, top = self.origin
+        width, height = self.world_size
+        visible = (
+            location[0] < left + width
+            and location[0] + size[0] > left
+            and location[1] < top + height
+            and location[1] + size[1] > top
+        )
+        self.stats['visible' if visible else 'culled'] += 1
+        return visible
+
+    def scaled(self, surface: Surface) -> Surface:
+        """:return: The surface at the size it is drawn with the current zoom"""
+        if self.zoom == 1:
+            return surface
+        return ASSETS.scaled(surface, self.zoom)
+
+    def scaled_all(self, surfaces: Iterable[Surface]) -> Iterable[Surface]:
+        """:return: Every surface at the size it is drawn with, without a call per surface when not zoomed"""
+        if self.zoom == 1:
+            return surfaces
+        return map(self.scaled, surfaces)
+
+    def draw_background(self, target: Surface, surface: Surface) -> None:
+        """Tile a seamless surface over the whole target, scrolling with the camera"""
+        surface = self.scaled(surface)
+        width, height = surface.get_size()
+        left, top = self.world_to_screen((0, 0))
+        target.fblits(
+            [
+                (surface, (x, y))
+                for x in range(int(left % width) - width, target.get_width(), width)
+                for y in range(int(top % height) - height, target.get_height(), height)
+            ]
+        )
+
+    def reset_stats(self) -> None:
+        self.stats['visible'] = 0
+        self.stats['culled'] = 0
+
+    def get_debug_info(self) -> str:
+        return (f"Camera: {self.location.x:.0f}, {self.location.y:.0f}\n"
+                f"Zoom: {self.zoom:.2f}x\n"
+                f"Visible: {self.stats['visible']}\n"
+                f"Culled: {self.stats['culled']}")
@@ -1,19 +1,34 @@
 # scripts/collision_system.py - Complete high-performance collision system
 # Generated in part with Claude
 
-from typing import Dict, List, Set, Tuple
+from math import ceil, floor, inf, sqrt
+from typing import Dict, Iterator, List, Set, Tuple
 from scripts.readable_classes import XYFloat, XYInt
 from scripts.config import DISPLAY_SIZE
+from scripts.pygame_utils import calculate_distance
+from entities.base_entity import BaseDrop, BaseEntity
 from entities.enemy import Enemy
+from entities.enemy_store import EnemyStore, NO_CELL
 from weapons.base_weapon import BaseAmmo
 from pygame import FRect
+import numpy as np
 
 
 class SpatialGrid:
+    """
+    Buckets enemies by the grid cell their location falls in
+
+    Either rebuilt every frame with clear and add_enemy, or maintained incrementally with insert, move and remove.
+    Incremental cells are dicts used as ordered sets so an enemy can leave its cell in O(1).
+    """
+
     def __init__(self, cell_size: int = 64) -> None:  # Smaller cells for better distribution
         self.cell_size: int = cell_size
         # Use tuples for dictionary keys - maximum performance
-        self.cells: Dict[tuple[int, int], List[Enemy]] = {}
+        self.cells: Dict[tuple[int, int], List[Enemy] | Dict[Enemy, None]] = {}
+        # Cell of every incrementally tracked enemy
+        self.entity_cells: Dict[Enemy, tuple[int, int]] = {}
+        self.tracked_store: EnemyStore | None = None
         self.grid_width: int = (DISPLAY_SIZE.x // cell_size) + 2  # Extra padding
         self.grid_height: int = (DISPLAY_SIZE.y // cell_size) + 2
 
@@ -32,9 +47,30 @@ class SpatialGrid:
 
         return clamped_x, clamped_y
 
+    def set_cell_size(self, cell_size: int) -> None:
+        """Change the cell size, emptying the grid so everything has to be added again"""
+        self.cell_size = cell_size
+        self.inv_cell_size = 1.0 / cell_size
+        self.grid_width = (DISPLAY_SIZE.x // cell_size) + 2
+        self.grid_height = (DISPLAY_SIZE.y // cell_size) + 2
+        self.clear()
+        if self.tracked_store is not None:
+            self.tracked_store.cells[:self.tracked_store.count] = NO_CELL
+
+    def get_cell_coords_array(self, locations: np.ndarray) -> np.ndarray:
+        """Cell coordinates of an (n, 2) array of locations, calculated in one batch"""
+        cells: np.ndarray = (locations * self.inv_cell_size).astype(np.int64)
+        np.clip(cells[:, 0], 0, self.grid_width - 1, out=cells[:, 0])
+        np.clip(cells[:, 1], 0, self.grid_height - 1, out=cells[:, 1])
+        return cells
+
+    def contains_cell(self, cell: tuple[int, int]) -> bool:
+        return 0 <= cell[0] < self.grid_width and 0 <= cell[1] < self.grid_height
+
     def clear(self) -> None:
         """Clear all cells - call this each frame"""
         self.cells.clear()
+        self.entity_cells.clear()
 
     def add_enemy(self, enemy: Enemy) -> None:
         """Add enemy to appropriate cell"""
@@ -43,6 +79,80 @@ class SpatialGrid:
             self.cells[cell] = []
         self.cells[cell].append(enemy)
 
+    def get_store_cell_coords(self, store: EnemyStore) -> np.ndarray:
+        """Cell coordinates of every enemy of a store, calculated in one batch"""
+        return self.get_cell_coords_array(store.locations[:store.count])
+
+    def add_enemy_store(self, store: EnemyStore) -> None:
+        """Add every enemy of a store, calculating all cell coordinates in one batch"""
+        cells: np.ndarray = self.get_store_cell_coords(store)
+
+        for enemy, cell in zip(store.enemies, map(tuple, cells.tolist())):
+            if cell not in self.cells:
+                self.cells[cell] = []
+            self.cells[cell].append(enemy)
+
+    def _insert_at(self, enemy: Enemy, cell: tuple[int, int]) -> None:
+        bucket: Dict[Enemy, None] | None = self.cells.get(cell)
+        if bucket is None:
+            self.cells[cell] = bucket = {}
+        bucket[enemy] = None
+        self.entity_cells[enemy] = cell
+
+    def insert(self, enemy: Enemy, location: XYFloat) -> None:
+        """Start tracking an enemy incrementally"""
+        self._insert_at(enemy, self.get_cell_coords(location))
+
+    def remove(self, enemy: Enemy) -> None:
+        """Stop tracking an enemy, does nothing if it is not tracked"""
+        cell: tuple[int, int] | None = self.entity_cells.pop(enemy, None)
+        if cell is None:
+            return
+        bucket: Dict[Enemy, None] = self.cells[cell]
+        del bucket[enemy]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, enemy: Enemy, location: XYFloat) -> bool:
+        """
+        Move a tracked enemy to the cell of its new location, inserting it if it is not tracked yet
+        :return: True if the enemy changed cells
+        """
+        cell: tuple[int, int] = self.get_cell_coords(location)
+        if self.entity_cells.get(enemy) == cell:
+            return False
+        self.remove(enemy)
+        self._insert_at(enemy, cell)
+        return True
+
+    def sync_enemy_store(self, store: EnemyStore) -> int:
+        """
+        Incrementally move the enemies of a store that crossed into another cell since the last sync
+        Enemies removed from the store leave the grid through the store's remove listener.
+        :return: The amount of enemies that changed cells, new enemies included
+        """
+        if self.tracked_store is not store:
+            if self.tracked_store is not None:
+                self.tracked_store.remove_listeners.remove(self.remove)
+            self.cells.clear()
+            self.entity_cells.clear()
+            store.cells[:store.count] = NO_CELL
+            store.remove_listeners.append(self.remove)
+            self.tracked_store = store
+
+        cells: np.ndarray = self.get_store_cell_coords(store)
+        changed: np.ndarray = np.flatnonzero((cells != store.cells[:store.count]).any(axis=1))
+        if not len(changed):
+            return 0
+
+        enemies: List[Enemy] = store.enemies
+        for index, cell in zip(changed.tolist(), map(tuple, cells[changed].tolist())):
+            enemy: Enemy = enemies[index]
+            self.remove(enemy)
+            self._insert_at(enemy, cell)
+        store.cells[changed] = cells[changed]
+        return len(changed)
+
     def get_enemies_in_cells(self, cells: Set[tuple[int, int]]) -> List[Enemy]:
         """Get all enemies from a set of cells (tuples for performance)"""
         enemies: List[Enemy] = []
@@ -58,16 +168,179 @@ class SpatialGrid:
 
         for dx in range(-radius, radius + 1):
             for dy in range(-radius, radius + 1):
-                cell_x: int = center_cell[0] + dx
-                cell_y: int = center_cell[1] + dy
-                cell: tuple[int, int] = (cell_x, cell_y)
-
-                if (0 <= cell_x < self.grid_width and
-                        0 <= cell_y < self.grid_height):
+                cell: tuple[int, int] = (center_cell[0] + dx, center_cell[1] + dy)
+                if self.contains_cell(cell):
                     cells.add(cell)
 
         return cells
 
+    # Spatial queries, entities are binned by their top left corner and must not be larger than a cell
+
+    def iterate_area(self, left: float, top: float, right: float, bottom: float) -> Iterator[BaseEntity]:
+        """Every entity that could overlap the area, including one cell up and left for the extent of entities"""
+        min_x, min_y = self.get_cell_coords(XYFloat(left, top))
+        max_x, max_y = self.get_cell_coords(XYFloat(right, bottom))
+        for cell_x in range(min_x - 1, max_x + 1):
+            for cell_y in range(min_y - 1, max_y + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    yield from bucket
+
+    def query_rect(self, rect: FRect) -> List[BaseEntity]:
+        """:return: Every entity overlapping the rect, matching FRect.colliderect"""
+        return [
+            entity
+            for entity in self.iterate_area(rect.left, rect.top, rect.right, rect.bottom)
+            if rect.colliderect(entity.get_rect())
+        ]
+
+    def center_distances(self, point: XYFloat, entities: List[BaseEntity]) -> np.ndarray:
+        """Distance from the point to the center of every entity, read straight from the store when tracking one"""
+        if self.tracked_store is not None:
+            store: EnemyStore = self.tracked_store
+            indices: np.ndarray = np.fromiter((entity.index for entity in entities), np.int64, len(entities))
+            centers: np.ndarray = store.locations[indices] + store.sizes[indices] / 2
+            return np.hypot(centers[:, 0] - point.x, centers[:, 1] - point.y)
+        return np.array([calculate_distance(point, entity.location_center) for entity in entities], dtype=np.float64)
+
+    def _circle_candidates(self, center: XYFloat, radius: float) -> Tuple[List[BaseEntity], np.ndarray]:
+        """:return: The entities with their center within the radius and their distances"""
+        entities: List[BaseEntity] = list(
+            self.iterate_area(center.x - radius, center.y - radius, center.x + radius, center.y + radius)
+        )
+        distances: np.ndarray = self.center_distances(center, entities)
+        inside: np.ndarray = np.flatnonzero(distances <= radius)
+        return [entities[index] for index in inside.tolist()], distances[inside]
+
+    def query_circle(self, center: XYFloat, radius: float) -> List[BaseEntity]:
+        """:return: Every entity with its center within the radius"""
+        return self._circle_candidates(center, radius)[0]
+
+    def query_nearest(self, point: XYFloat, k: int = 1, max_distance: float = inf) -> List[BaseEntity]:
+        """
+        Search a growing circle around the point so nearby entities are found without looking at the whole grid
+        :return: Up to k entities with their center closest to the point, nearest first
+        """
+        radius: float = min(self.cell_size, max_distance)
+        while True:
+            entities, distances = self._circle_candidates(point, radius)
+            # Once the circle holds k entities nothing outside of it can be closer than them
+            if len(entities) >= k or radius >= max_distance or not self.cells:
+                break
+            if max_distance == inf and self.cells_within(point, radius) == len(self.cells):
+                break
+            radius = min(radius * 2, max_distance)
+
+        nearest: np.ndarray = np.argsort(distances, kind='stable')[:k]
+        return [entities[index] for index in nearest.tolist()]
+
+    def cells_within(self, point: XYFloat, radius: float) -> int:
+        """:return: The amount of non-empty cells the square around the circle covers"""
+        min_x, min_y = self.get_cell_coords(XYFloat(point.x - radius, point.y - radius))
+        max_x, max_y = self.get_cell_coords(XYFloat(point.x + radius, point.y + radius))
+        return sum(1 for cell_x, cell_y in self.cells if min_x - 1 <= cell_x <= max_x and min_y - 1 <= cell_y <= max_y)
+
+    def raycast(
+            self,
+            origin: XYFloat,
+            direction: XYFloat,
+            max_distance: float,
+    ) -> Tuple[BaseEntity, float] | None:
+        """
+        Walk the cells along the ray and test the entities binned around each of them
+        :return: The first entity the ray hits and the distance to it
+        """
+        if max_distance == inf:
+            raise ValueError("Raycasts need a finite max_distance")
+        if direction.length_squared() == 0:
+            return None
+        direction = direction.normalize()
+        inv_x: float = 1 / direction.x if direction.x else inf
+        inv_y: float = 1 / direction.y if direction.y else inf
+
+        cell_x, cell_y = floor(origin.x * self.inv_cell_size), floor(origin.y * self.inv_cell_size)
+        step_x: int = 1 if direction.x > 0 else -1
+        step_y: int = 1 if direction.y > 0 else -1
+        # Distance along the ray to the next vertical and horizontal cell border
+        next_x: float = ((cell_x + (step_x > 0)) * self.cell_size - origin.x) * inv_x if direction.x else inf
+        next_y: float = ((cell_y + (step_y > 0)) * self.cell_size - origin.y) * inv_y if direction.y else inf
+        delta_x: float = self.cell_size * abs(inv_x)
+        delta_y: float = self.cell_size * abs(inv_y)
+
+        checked: Set[tuple[int, int]] = set()
+        closest: BaseEntity | None = None
+        closest_distance: float = max_distance
+        entered: float = 0.0
+        while entered <= closest_distance:
+            for cell in ((cell_x, cell_y), (cell_x - 1, cell_y), (cell_x, cell_y - 1), (cell_x - 1, cell_y - 1)):
+                cell = self.clamp_cell(cell)
+                if cell in checked:
+                    continue
+                checked.add(cell)
+                for entity in self.cells.get(cell, ()):
+                    distance: float | None = self.ray_rect_distance(origin, inv_x, inv_y, entity.get_rect())
+                    if distance is not None and distance <= closest_distance:
+                        closest, closest_distance = entity, distance
+
+            # Step into the next cell along the ray
+            if next_x < next_y:
+                entered = next_x
+                next_x += delta_x
+                cell_x += step_x
+            else:
+                entered = next_y
+                next_y += delta_y
+                cell_y += step_y
+
+        if closest is None:
+            return None
+        return closest, closest_distance
+
+    @staticmethod
+    def ray_rect_distance(origin: XYFloat, inv_x: float, inv_y: float, rect: FRect) -> float | None:
+        """Slab test, :return: Distance along the ray to the rect or None if it misses"""
+        if inv_x == inf:
+            if not rect.left <= origin.x <= rect.right:
+                return None
+            near_x, far_x = -inf, inf
+        else:
+            near_x, far_x = sorted(((rect.left - origin.x) * inv_x, (rect.right - origin.x) * inv_x))
+        if inv_y == inf:
+            if not rect.top <= origin.y <= rect.bottom:
+                return None
+            near_y, far_y = -inf, inf
+        else:
+            near_y, far_y = sorted(((rect.top - origin.y) * inv_y, (rect.bottom - origin.y) * inv_y))
+
+        near: float = max(near_x, near_y, 0.0)
+        if near > min(far_x, far_y):
+            return None
+        return near
+
+    def clamp_cell(self, cell: tuple[int, int]) -> tuple[int, int]:
+        return max(0, min(cell[0], self.grid_width - 1)), max(0, min(cell[1], self.grid_height - 1))
+
+
+class SpatialHash(SpatialGrid):
+    """
+    World space spatial grid without bounds, only the cells that hold enemies exist
+    Nothing is clamped to the display, so enemies far from the screen spread over their own cells instead of
+    piling into the edge cells.
+    """
+
+    def get_cell_coords(self, location: XYFloat) -> tuple[int, int]:
+        # Floor rather than truncate so cells stay the same size on both sides of the origin
+        return floor(location.x * self.inv_cell_size), floor(location.y * self.inv_cell_size)
+
+    def get_cell_coords_array(self, locations: np.ndarray) -> np.ndarray:
+        return np.floor(locations * self.inv_cell_size).astype(np.int64)
+
+    def contains_cell(self, cell: tuple[int, int]) -> bool:
+        return True
+
+    def clamp_cell(self, cell: tuple[int, int]) -> tuple[int, int]:
+        return cell
+
 
 class CollisionManager:
     def __init__(self, spatial_grid: SpatialGrid) -> None:
@@ -77,10 +350,12 @@ class CollisionManager:
         self._collision_results: Dict[BaseAmmo, Enemy] = {}
         self._ammo_by_cell: Dict[tuple[int, int], List[BaseAmmo]] = {}
         self._checked_pairs: Set[tuple[BaseAmmo, Enemy]] = set()
+        self.pair_tests: int = 0
 
     def batch_check_collisions(self, all_ammo: List[BaseAmmo]) -> Dict[BaseAmmo, Enemy]:
         """Optimized batch collision detection - uses tuples internally for speed"""
         # Clear previous results
+        self.pair_tests = 0
         self._collision_results.clear()
         self._ammo_by_cell.clear()
         self._checked_pairs.clear()
@@ -99,12 +374,8 @@ class CollisionManager:
             relevant_cells: Set[tuple[int, int]] = set()
             for dx in [-1, 0, 1]:
                 for dy in [-1, 0, 1]:
-                    adjacent_x: int = cell[0] + dx
-                    adjacent_y: int = cell[1] + dy
-                    adjacent_cell: tuple[int, int] = (adjacent_x, adjacent_y)
-
-                    if (0 <= adjacent_x < self.spatial_grid.grid_width and
-                            0 <= adjacent_y < self.spatial_grid.grid_height):
+                    adjacent_cell: tuple[int, int] = (cell[0] + dx, cell[1] + dy)
+                    if self.spatial_grid.contains_cell(adjacent_cell):
                         relevant_cells.add(adjacent_cell)
 
             # Get enemies from relevant cells
@@ -128,7 +399,8 @@ class CollisionManager:
             ammo_bottom: float = ammo_rect.bottom
             ammo_bounds: tuple[float, float, float, float] = (ammo_left, ammo_top, ammo_right, ammo_bottom)
 
-            for enemy in enemies:
+            tested: int = 0
+            for tested, enemy in enumerate(enemies, 1):
                 # Quick bounds check first
                 enemy_rect = enemy.get_rect()
                 if (ammo_bounds[2] < enemy_rect.left or  # ammo right < enemy left
@@ -141,83 +413,371 @@ class CollisionManager:
                 if ammo_rect.colliderect(enemy_rect):
                     self._collision_results[ammo] = enemy
                     break  # Each ammo can only hit one enemy
+            self.pair_tests += tested
 
 
-class HighPerformanceCollisionSystem:
-    """Main collision system that coordinates everything"""
+class NumpyCollisionManager:
+    """
+    Collision backend that bins every AABB by sorting and tests candidate pairs as NumPy batches
+
+    Enemies are sorted by a hash of their cell, so the enemies of a cell are one contiguous run of the sorted order
+    that searchsorted finds for bounded and unbounded grids alike.
+    Every ammo gathers the runs of the 3x3 cells around it and all of those pairs are tested at once.
+    Each ammo hits the overlapping enemy with the lowest index, like CollisionManager it only looks at adjacent cells.
+    """
+
+    # Offsets of the 3x3 block of cells around a cell
+    NEIGHBOUR_OFFSETS: np.ndarray = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+
+    def __init__(self, spatial_grid: SpatialGrid) -> None:
+        self.spatial_grid: SpatialGrid = spatial_grid
+        self.enemies: List[Enemy] | EnemyStore = []
+        self.cells_used: int = 0
+        self.pair_tests: int = 0
+        self._collision_results: Dict[BaseAmmo, Enemy] = {}
+
+    @staticmethod
+    def cell_keys(cells: np.ndarray) -> np.ndarray:
+        """Hash cell coordinates into a single sortable integer, unique while coordinates fit in 31 bits"""
+        return (cells[..., 0] << 32) + cells[..., 1]
+
+    def set_enemies(self, enemies: List[Enemy] | EnemyStore) -> None:
+        """Enemies are binned when collisions are checked, so enemies that died since are never hit"""
+        self.enemies = enemies
+
+    def _enemy_bounds(self) -> Tuple[List[Enemy], np.ndarray, np.ndarray]:
+        """:return: The enemies with their top left locations and sizes"""
+        if isinstance(self.enemies, EnemyStore):
+            count: int = self.enemies.count
+            return self.enemies.enemies, self.enemies.locations[:count], self.enemies.sizes[:count]
+
+        enemies: List[Enemy] = list(self.enemies)
+        rects: np.ndarray = np.array([enemy.get_rect() for enemy in enemies], dtype=np.float64).reshape(-1, 4)
+        return enemies, rects[:, :2], rects[:, 2:]
+
+    @staticmethod
+    def _ammo_bounds(all_ammo: List[BaseAmmo]) -> np.ndarray:
+        """:return: The left, top, width and height of every ammo"""
+        return np.array(
+            [(*ammo.current_location.to_tuple(), *ammo.hitbox_size) for ammo in all_ammo],
+            dtype=np.float64,
+        )
+
+    @staticmethod
+    def _expand_runs(
+            owners: np.ndarray,
+            run_starts: np.ndarray,
+            run_lengths: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Expand runs of a sorted order into one (owner, position in the sorted order) entry per candidate pair"""
+        pair_count: int = int(run_lengths.sum())
+        run_offsets: np.ndarray = np.arange(pair_count) - np.repeat(np.cumsum(run_lengths) - run_lengths, run_lengths)
+        return np.repeat(owners, run_lengths), np.repeat(run_starts, run_lengths) + run_offsets
+
+    def _resolve_pairs(
+            self,
+            all_ammo: List[BaseAmmo],
+            ammo_bounds: np.ndarray,
+            enemies: List[Enemy],
+            enemy_locations: np.ndarray,
+            enemy_sizes: np.ndarray,
+            pair_ammo: np.ndarray,
+            pair_enemies: np.ndarray,
+    ) -> Dict[BaseAmmo, Enemy]:
+        """Test every candidate pair at once and keep the first hit of every ammo"""
+        self.pair_tests = len(pair_ammo)
+
+        # Strict overlap, matching FRect.colliderect
+        ammo_left: np.ndarray = ammo_bounds[pair_ammo, 0]
+        ammo_top: np.ndarray = ammo_bounds[pair_ammo, 1]
+        enemy_left: np.ndarray = enemy_locations[pair_enemies, 0]
+        enemy_top: np.ndarray = enemy_locations[pair_enemies, 1]
+        hits: np.ndarray = (
+            (ammo_left < enemy_left + enemy_sizes[pair_enemies, 0])
+            & (ammo_left + ammo_bounds[pair_ammo, 2] > enemy_left)
+            & (ammo_top < enemy_top + enemy_sizes[pair_enemies, 1])
+            & (ammo_top + ammo_bounds[pair_ammo, 3] > enemy_top)
+        )
+        hit_ammo: np.ndarray = pair_ammo[hits]
+        hit_enemies: np.ndarray = pair_enemies[hits]
+
+        # First hit of every ammo is the lowest enemy index
+        first: np.ndarray = np.lexsort((hit_enemies, hit_ammo))
+        hit_ammo, hit_enemies = hit_ammo[first], hit_enemies[first]
+        hit_ammo, first_indices = np.unique(hit_ammo, return_index=True)
+        for ammo_index, enemy_index in zip(hit_ammo.tolist(), hit_enemies[first_indices].tolist()):
+            self._collision_results[all_ammo[ammo_index]] = enemies[enemy_index]
+
+        return self._collision_results
+
+    def batch_check_collisions(
+            self,
+            all_ammo: List[BaseAmmo],
+            ammo_bounds: np.ndarray = None,
+    ) -> Dict[BaseAmmo, Enemy]:
+        """:param ammo_bounds: Left, top, width and height of every ammo when the caller already has them"""
+        self._collision_results.clear()
+        self.pair_tests = 0
+        enemies, enemy_locations, enemy_sizes = self._enemy_bounds()
+        if not all_ammo or not enemies:
+            self.cells_used = 0
+            return self._collision_results
+
+        grid: SpatialGrid = self.spatial_grid
+
+        # Sort the enemies by cell
+        enemy_keys: np.ndarray = self.cell_keys(grid.get_cell_coords_array(enemy_locations))
+        order: np.ndarray = np.argsort(enemy_keys, kind='stable')
+        sorted_keys: np.ndarray = enemy_keys[order]
+        self.cells_used = int(np.count_nonzero(np.diff(sorted_keys))) + 1
+
+        if ammo_bounds is None:
+            ammo_bounds = self._ammo_bounds(all_ammo)
+        ammo_cells: np.ndarray = grid.get_cell_coords_array(ammo_bounds[:, :2])
+
+        # Every (ammo, neighbouring cell) with at least one enemy in it, cells outside a bounded grid are never found
+        neighbour_keys: np.ndarray = self.cell_keys(ammo_cells[:, None, :] + self.NEIGHBOUR_OFFSETS[None, :, :])
+        run_starts: np.ndarray = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        run_lengths: np.ndarray = np.searchsorted(sorted_keys, neighbour_keys, side='right') - run_starts
+        ammo_indices, offset_indices = np.nonzero(run_lengths)
+
+        # Expand each cell into its run of enemies
+        pair_ammo, positions = self._expand_runs(
+            ammo_indices,
+            run_starts[ammo_indices, offset_indices],
+            run_lengths[ammo_indices, offset_indices],
+        )
+        return self._resolve_pairs(
+            all_ammo, ammo_bounds, enemies, enemy_locations, enemy_sizes, pair_ammo, order[positions]
+        )
+
+
+class SweepCollisionManager(NumpyCollisionManager):
+    """
+    Sort and sweep collision backend, no cells at all
+
+    Enemies are sorted by their left edge. The candidates of an ammo are the one contiguous run of enemies whose left
+    edge lies between the ammo's left edge minus the widest enemy and its right edge, found with searchsorted.
+    Only the x axis prunes, so it does best on hordes spread wide rather than dense clumps.
+    """
+
+    def batch_check_collisions(
+            self,
+            all_ammo: List[BaseAmmo],
+            ammo_bounds: np.ndarray = None,
+    ) -> Dict[BaseAmmo, Enemy]:
+        """:param ammo_bounds: Left, top, width and height of every ammo when the caller already has them"""
+        self._collision_results.clear()
+        self.pair_tests = 0
+        self.cells_used = 0
+        enemies, enemy_locations, enemy_sizes = self._enemy_bounds()
+        if not all_ammo or not enemies:
+            return self._collision_results
+
+        order: np.ndarray = np.argsort(enemy_locations[:, 0], kind='stable')
+        sorted_left: np.ndarray = enemy_locations[order, 0]
+        widest: float = float(enemy_sizes[:, 0].max())
+
+        if ammo_bounds is None:
+            ammo_bounds = self._ammo_bounds(all_ammo)
+        run_starts: np.ndarray = np.searchsorted(sorted_left, ammo_bounds[:, 0] - widest, side='right')
+        run_ends: np.ndarray = np.searchsorted(sorted_left, ammo_bounds[:, 0] + ammo_bounds[:, 2], side='left')
+        run_lengths: np.ndarray = np.maximum(run_ends - run_starts, 0)
+
+        pair_ammo, positions = self._expand_runs(np.arange(len(all_ammo)), run_starts, run_lengths)
+        return self._resolve_pairs(
+            all_ammo, ammo_bounds, enemies, enemy_locations, enemy_sizes, pair_ammo, order[positions]
+        )
 
-    def __init__(self, cell_size: int = 64) -> None:
-        self.spatial_grid: SpatialGrid = SpatialGrid(cell_size)
-        self.collision_manager: CollisionManager = CollisionManager(self.spatial_grid)
+
+class HighPerformanceCollisionSystem:
+    """
+    Main collision system that coordinates everything
+    Incremental mode keeps the spatial grid between frames and only moves enemies of an EnemyStore that crossed a cell
+    boundary, plain enemy lists are still rebuilt every frame.
+    The backend picks how ammo is checked against enemies: "grid" with CollisionManager, "numpy" with
+    NumpyCollisionManager, which bins the enemies itself, or "sweep" with SweepCollisionManager.
+    Unbounded systems use a SpatialHash so collisions keep working anywhere in the world.
+    Adaptive systems periodically re-tune the cell size from how many enemies share a cell.
+    The query methods look up enemies through the spatial grid, drops have a grid of their own.
+    """
+
+    BACKENDS: tuple[str, ...] = ("grid", "numpy", "sweep")
+
+    # Adaptive cell size
+    TARGET_ENEMIES_PER_CELL: float = 4.0
+    RETUNE_INTERVAL: int = 60  # Enemy updates between re-tunes
+    MIN_CELL_SIZE: int = 16
+    MAX_CELL_SIZE: int = 512
+
+    def __init__(
+            self,
+            cell_size: int = 64,
+            incremental: bool = False,
+            backend: str = "grid",
+            bounded: bool = True,
+            adaptive: bool = False,
+    ) -> None:
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown collision backend: {backend}")
+        self.backend: str = backend
+        self.incremental: bool = incremental
+        self.spatial_grid: SpatialGrid = SpatialGrid(cell_size) if bounded else SpatialHash(cell_size)
+        # Drops never move, they are inserted when dropped and removed when picked up
+        self.drop_grid: SpatialGrid = SpatialGrid(cell_size) if bounded else SpatialHash(cell_size)
+        self.collision_manager: CollisionManager | NumpyCollisionManager
+        if backend == "numpy":
+            self.collision_manager = NumpyCollisionManager(self.spatial_grid)
+        elif backend == "sweep":
+            self.collision_manager = SweepCollisionManager(self.spatial_grid)
+        else:
+            self.collision_manager = CollisionManager(self.spatial_grid)
+
+        self.adaptive: bool = adaptive
+        self.updates_since_retune: int = 0
+        # Cells can be no smaller than the largest enemy or ammo or neighbouring cells stop covering overlaps
+        self.largest_entity: float = 0
+        # Enemies of the last update, indexed again when the cells have to grow between updates
+        self.enemies: List[Enemy] | EnemyStore | None = None
 
         # Statistics for debugging
         self.stats: Dict[str, int] = {
             'enemies_processed': 0,
             'ammo_processed': 0,
             'collisions_found': 0,
-            'cells_used': 0
+            'cells_used': 0,
+            'cell_crossings': 0,
+            'pair_tests': 0,
         }
 
-    def update_enemies(self, enemies: List[Enemy]) -> None:
+    def update_enemies(self, enemies: List[Enemy] | EnemyStore) -> None:
         """Add all enemies to spatial grid"""
-        self.spatial_grid.clear()
-        for enemy in enemies:
-            self.spatial_grid.add_enemy(enemy)
+        if self.adaptive:
+            self.updates_since_retune += 1
+            if self.updates_since_retune >= self.RETUNE_INTERVAL:
+                self.updates_since_retune = 0
+                self.retune_cell_size(enemies)
+
+        self.enemies = enemies
+        self.index_enemies(enemies)
+
+    def index_enemies(self, enemies: List[Enemy] | EnemyStore) -> None:
+        if isinstance(self.collision_manager, NumpyCollisionManager):
+            self.collision_manager.set_enemies(enemies)
+
+        if self.incremental and isinstance(enemies, EnemyStore):
+            self.stats['cell_crossings'] = self.spatial_grid.sync_enemy_store(enemies)
+        else:
+            self.spatial_grid.clear()
+            if isinstance(enemies, EnemyStore):
+                self.spatial_grid.add_enemy_store(enemies)
+            else:
+                for enemy in enemies:
+                    self.spatial_grid.add_enemy(enemy)
+            self.stats['cell_crossings'] = len(enemies)
 
         self.stats['enemies_processed'] = len(enemies)
         self.stats['cells_used'] = len(self.spatial_grid.cells)
 
-    def check_all_collisions(self, all_weapons_ammo: List[BaseAmmo]) -> Dict[BaseAmmo, Enemy]:
-        """Check collisions for all projectiles from all weapons"""
-        collisions: Dict[BaseAmmo, Enemy] = self.collision_manager.batch_check_collisions(all_weapons_ammo)
+    def check_all_collisions(
+            self,
+            all_weapons_ammo: List[BaseAmmo],
+            ammo_bounds: np.ndarray = None,
+    ) -> Dict[BaseAmmo, Enemy]:
+        """
+        Check collisions for all projectiles from all weapons
+        :param ammo_bounds: Left, top, width and height of every ammo, saves the array backends reading the ammo
+        """
+        if self.adaptive:
+            if ammo_bounds is not None:
+                largest_ammo: float = float(ammo_bounds[:, 2:].max(initial=0))
+            else:
+                largest_ammo = max((max(ammo.hitbox_size) for ammo in all_weapons_ammo), default=0)
+            self.fit_entity(largest_ammo)
+
+        if isinstance(self.collision_manager, NumpyCollisionManager):
+            collisions: Dict[BaseAmmo, Enemy] = self.collision_manager.batch_check_collisions(
+                all_weapons_ammo, ammo_bounds
+            )
+        else:
+            collisions = self.collision_manager.batch_check_collisions(all_weapons_ammo)
 
         self.stats['ammo_processed'] = len(all_weapons_ammo)
         self.stats['collisions_found'] = len(collisions)
+        self.stats['pair_tests'] = self.collision_manager.pair_tests
+        if isinstance(self.collision_manager, NumpyCollisionManager):
+            self.stats['cells_used'] = self.collision_manager.cells_used
 
         return collisions
 
-    def get_debug_info(self) -> str:
-        """Get performance statistics"""
-        enemies_count: int = self.stats['enemies_processed']
-        ammo_count: int = self.stats['ammo_processed']
-        collisions_count: int = self.stats['collisions_found']
-        cells_count: int = self.stats['cells_used']
+    def fit_entity(self, size: float) -> None:
+        """Grow the cells right away for an entity larger than them instead of waiting for the next re-tune"""
+        if size <= self.largest_entity:
+            return
+        self.largest_entity = size
+        if size > self.spatial_grid.cell_size:
+            self.spatial_grid.set_cell_size(min(ceil(size / 8) * 8, self.MAX_CELL_SIZE))
+            if self.enemies is not None:
+                self.index_enemies(self.enemies)
 
-        return (f"Enemies: {enemies_count}\n"
-                f"Ammo: {ammo_count}\n"
-                f"Collisions: {collisions_count}\n"
-                f"Cells: {cells_count}")
+    def retune_cell_size(self, enemies: List[Enemy] | EnemyStore) -> None:
+        """Scale the cells towards TARGET_ENEMIES_PER_CELL enemies per occupied cell"""
+        occupied_cells: int = len(self.spatial_grid.cells)
+        if not occupied_cells or not len(enemies):
+            return
+
+        if isinstance(enemies, EnemyStore):
+            largest_enemy: float = float(enemies.sizes[:enemies.count].max())
+        else:
+            largest_enemy = max(max(enemy.surface.get_size()) for enemy in enemies)
+        self.largest_entity = max(self.largest_entity, largest_enemy)
 
+        # Occupied cells scale with the cell area, so the cell side scales with the root of the occupancy
+        current: int = self.spatial_grid.cell_size
+        enemies_per_cell: float = len(enemies) / occupied_cells
+        cell_size: float = current * sqrt(self.TARGET_ENEMIES_PER_CELL / enemies_per_cell)
+        cell_size = min(max(cell_size, self.largest_entity, self.MIN_CELL_SIZE), self.MAX_CELL_SIZE)
+        cell_size = ceil(cell_size / 8) * 8
 
-# Integration helper for weapons
-class WeaponCollisionHelper:
-    """Helper to integrate weapons with the new collision system"""
+        # Only rebuild for a meaningful change
+        if current < self.largest_entity or not 0.75 < cell_size / current < 1.33:
+            self.spatial_grid.set_cell_size(cell_size)
 
-    def __init__(self) -> None:
-        self.collision_system: HighPerformanceCollisionSystem | None = None
-        self.all_ammo: List[BaseAmmo] = []  # Collect ammo from all weapons
-        self.collision_results: Dict[BaseAmmo, Enemy] = {}
+    def query_rect(self, rect: FRect) -> List[Enemy]:
+        return self.spatial_grid.query_rect(rect)
 
-    def set_collision_system(self, collision_system: HighPerformanceCollisionSystem) -> None:
-        self.collision_system = collision_system
+    def query_circle(self, center: XYFloat, radius: float) -> List[Enemy]:
+        return self.spatial_grid.query_circle(center, radius)
 
-    def register_ammo(self, weapon_ammo: List[BaseAmmo]) -> None:
-        """Register ammo from a weapon for batch processing"""
-        self.all_ammo.extend(weapon_ammo)
+    def query_nearest(self, point: XYFloat, k: int = 1, max_distance: float = inf) -> List[Enemy]:
+        return self.spatial_grid.query_nearest(point, k, max_distance)
 
-    def process_all_collisions(self) -> Dict[BaseAmmo, Enemy]:
-        """Process all registered ammo at once"""
-        if not self.collision_system:
-            return {}
+    def raycast(self, origin: XYFloat, direction: XYFloat, max_distance: float) -> Tuple[Enemy, float] | None:
+        return self.spatial_grid.raycast(origin, direction, max_distance)
 
-        self.collision_results = self.collision_system.check_all_collisions(self.all_ammo)
-        return self.collision_results
+    def add_drop(self, drop: BaseDrop) -> None:
+        self.drop_grid.insert(drop, drop.location)
 
-    def clear_frame(self) -> None:
-        """Clear data for next frame"""
-        self.all_ammo.clear()
-        self.collision_results.clear()
+    def remove_drop(self, drop: BaseDrop) -> None:
+        self.drop_grid.remove(drop)
 
-    def did_ammo_hit(self, ammo: BaseAmmo) -> Enemy | None:
-        """Check if specific ammo hit an enemy"""
-        return self.collision_results.get(ammo, None)
\ No newline at end of file
+    def query_drops(self, rect: FRect) -> List[BaseDrop]:
+        return self.drop_grid.query_rect(rect)
+
+    def get_debug_info(self) -> str:
+        """Get performance statistics"""
+        enemies_count: int = self.stats['enemies_processed']
+        ammo_count: int = self.stats['ammo_processed']
+        collisions_count: int = self.stats['collisions_found']
+        cells_count: int = self.stats['cells_used']
+        crossings_count: int = self.stats['cell_crossings']
+        pair_tests_count: int = self.stats['pair_tests']
+
+        return (f"Enemies: {enemies_count}\n"
+                f"Ammo: {ammo_count}\n"
+                f"Collisions: {collisions_count}\n"
+                f"Backend: {self.backend}\n"
+                f"Pair tests: {pair_tests_count}\n"
+                f"Cells: {cells_count}\n"
+                f"Cell size: {self.spatial_grid.cell_size}\n"
+                f"Cell moves: {crossings_count}")
@@ -8,4 +8,8 @@ WINDOW_SIZE: XYInt = XYInt(1920, 1080)
 # DISPLAY_SIZE: XYInt = XYInt(1280, 720)
 DISPLAY_SIZE: XYInt = XYInt(1920, 1080)
 BASE_SPEED = 100.0
+# Simulation ticks per second, independent of the rendered framerate
+TICK_RATE = 60
+# Longest frame the simulation catches up on, anything above is dropped instead of spiralling
+MAX_FRAME_TIME = 0.25
 PLAYER: "Player" = None
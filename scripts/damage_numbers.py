@@ -0,0 +1,138 @@
+from typing import TYPE_CHECKING
+
+from pygame import Surface
+
+from scripts.pygame_utils import default_font
+from scripts.renderer import LAYER_DAMAGE_TEXT
+
+if TYPE_CHECKING:
+    from entities.enemy import Enemy
+    from scripts.camera import Camera
+    from scripts.renderer import RenderQueue
+
+
+class DigitAtlas:
+    """
+    Every character a damage number can contain, rendered once into a single surface
+
+    Each glyph is a subsurface of the atlas, so a number is drawn by blitting a few small regions instead of rendering
+    text with the font.
+    """
+
+    CHARACTERS: str = "0123456789-"
+
+    def __init__(self, colour: tuple[int, int, int] = (0, 0, 0), size: int = 50):
+        font = default_font(size)
+        self.surface: Surface = font.render(self.CHARACTERS, True, colour)
+        self.glyphs: dict[str, Surface] = {}
+        # Horizontal advance of every glyph
+        self.widths: dict[str, int] = {}
+
+        left = 0
+        for character in self.CHARACTERS:
+            width = font.size(character)[0]
+            width = min(width, self.surface.get_width() - left)
+            self.glyphs[character] = self.surface.subsurface((left, 0, width, self.surface.get_height()))
+            self.widths[character] = width
+            left += width
+
+    def layout(self, text: str) -> list[tuple[Surface, int]]:
+        """:return: The glyph and horizontal offset of every character of the text the atlas has"""
+        glyphs = []
+        left = 0
+        for character in text:
+            if (glyph := self.glyphs.get(character)) is not None:
+                glyphs.append((glyph, left))
+                left += self.widths[character]
+        return glyphs
+
+
+class DamagePopup:
+    """A damage number shown over an enemy, reused by DamageNumbers once it fades"""
+
+    __slots__ = ("enemy", "damage", "age", "location", "glyphs")
+
+    def __init__(self):
+        self.enemy: "Enemy | None" = None
+        self.damage: float = 0
+        self.age: float = 0
+        self.location: tuple[float, float] = (0, 0)
+        self.glyphs: list[tuple[Surface, int]] = []
+
+
+class DamageNumbers:
+    """
+    Shows the damage of every hit over the enemy that took it
+
+    Popups come from a pool and are drawn from a shared DigitAtlas. Hits on an enemy that still shows a number add
+    to that number and restart it. At most max_popups are shown, a new one replaces the one shown longest.
+    """
+
+    def __init__(self, lifetime: float = 0.25, max_popups: int = 64, atlas: DigitAtlas = None):
+        self.lifetime = lifetime
+        self.max_popups = max_popups
+        self.atlas: DigitAtlas = atlas if atlas is not None else DigitAtlas()
+        # Live popups by enemy, in the order they were last hit
+        self.popups: dict["Enemy", DamagePopup] = {}
+        self.free: list[DamagePopup] = []
+        self.merged = 0
+
+    def __len__(self) -> int:
+        return len(self.popups)
+
+    def add(self, enemy: "Enemy", damage: float, location: tuple[float, float]) -> None:
+        """Show damage dealt to the enemy, merging it into the number the enemy already shows"""
+        if (popup := self.popups.pop(enemy, None)) is not None:
+            popup.damage += damage
+            self.merged += 1
+        else:
+            if len(self.popups) >= self.max_popups:
+                self._release(self.popups.pop(next(iter(self.popups))))
+            popup = self.free.pop() if self.free else DamagePopup()
+            popup.enemy = enemy
+            popup.damage = damage
+
+        popup.age = 0
+        popup.location = location
+        popup.glyphs = self.atlas.layout(str(int(popup.damage)))
+        self.popups[enemy] = popup
+
+    def draw(self, render_queue: "RenderQueue", delta_time: float, camera: "Camera" = None) -> None:
+        """
+        Age the popups and submit the glyphs of every one still showing
+        :param delta_time: Time since the last frame, not the last tick
+        :param camera: View to cull and place the popups by, drawn at their world location if None
+        """
+        sprites = []
+        height = self.atlas.surface.get_height()
+        for enemy, popup in list(self.popups.items()):
+            popup.age += delta_time
+            if popup.age > self.lifetime:
+                del self.popups[enemy]
+                self._release(popup)
+                continue
+            if camera is None:
+                x, y = popup.location
+                sprites.extend((glyph, (x + offset, y)) for glyph, offset in popup.glyphs)
+                continue
+
+            width = popup.glyphs[-1][1] + popup.glyphs[-1][0].get_width() if popup.glyphs else 0
+            if camera.is_visible(popup.location, (width, height)):
+                x, y = camera.world_to_screen(popup.location)
+                sprites.extend(
+                    (camera.scaled(glyph), (x + offset * camera.zoom, y)) for glyph, offset in popup.glyphs
+                )
+        render_queue.submit_many(sprites, LAYER_DAMAGE_TEXT)
+
+    def _release(self, popup: DamagePopup) -> None:
+        popup.enemy = None
+        self.free.append(popup)
+
+    def clear(self) -> None:
+        for popup in self.popups.values():
+            self._release(popup)
+        self.popups.clear()
+
+    def get_debug_info(self) -> str:
+        return (f"Damage numbers: {len(self.popups)} / {self.max_popups}\n"
+                f"Merged hits: {self.merged}")
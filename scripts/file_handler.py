@@ -1,9 +1,10 @@
 import json
 import os
 import pygame
-from functools import lru_cache
 
-BASE_IMAGE_PATH = "data/images/"
+from scripts.cache import CACHES, Cache, cached
+
+BASE_IMAGE_PATH = "assets/"
 
 
 class CustomJSONEncoder(json.JSONEncoder):
@@ -16,7 +17,103 @@ class CustomJSONEncoder(json.JSONEncoder):
         return super(CustomJSONEncoder, self).default(obj)
 
 
-@lru_cache
+class TransformCache:
+    """
+    Bounded cache of scaled and rotated variants of shared surfaces
+
+    Rotations are snapped to buckets of rotation_step degrees, so a sprite turned towards any direction is one of a
+    few dozen surfaces that are built the first time they are needed. The least recently used variants are dropped
+    once more than max_entries or max_bytes are cached.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, rotation_step: float = 5):
+        self.rotation_step = rotation_step
+        self.buckets = round(360 / rotation_step)
+        self.cache: Cache = CACHES.create("Transforms", max_entries, max_bytes)
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def rotation_bucket(self, angle: float) -> int:
+        """:return: The bucket of an angle in degrees, counterclockwise like pygame.transform.rotate"""
+        return round(angle / self.rotation_step) % self.buckets
+
+    def get(self, surface: pygame.Surface, scale: float = 1, angle: float = 0) -> pygame.Surface:
+        """:return: The surface scaled by a factor and rotated by the angle snapped to its bucket"""
+        bucket = self.rotation_bucket(angle)
+        if scale == 1 and bucket == 0:
+            return surface
+        return self.cache.get((surface, scale, bucket), lambda: self._transform(surface, scale, bucket))
+
+    def _transform(self, surface: pygame.Surface, scale: float, bucket: int) -> pygame.Surface:
+        if bucket == 0:
+            return pygame.transform.scale(surface, (surface.get_width() * scale, surface.get_height() * scale))
+        return pygame.transform.rotate(self.get(surface, scale), bucket * self.rotation_step)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+class AssetRegistry:
+    """
+    Decodes every image once and hands the same surface to everything that uses it
+
+    The surfaces are shared and must never be drawn on, copy or transform them instead.
+    Images are converted to the display's pixel format once a display exists, see convert.
+    """
+
+    def __init__(self, base_path: str = BASE_IMAGE_PATH):
+        self.base_path = base_path
+        self.images: dict[str, pygame.Surface] = {}
+        self.flipped_images: Cache = CACHES.create("Flipped images", max_entries=256)
+        self.transforms: TransformCache = TransformCache()
+        self.converted = False
+
+    def image(self, name: str) -> pygame.Surface:
+        if name not in self.images:
+            surface = pygame.image.load(f"{self.base_path}{name}")
+            if self.converted:
+                surface = surface.convert_alpha()
+            self.images[name] = surface
+        return self.images[name]
+
+    def orientations(self, surface: pygame.Surface) -> tuple[pygame.Surface, pygame.Surface]:
+        """:return: The surface and its horizontally flipped variant, flipped only the first time it is used"""
+        return surface, self.flipped_images.get(surface, lambda: pygame.transform.flip(surface, True, False))
+
+    def scaled(self, surface: pygame.Surface, scale: float) -> pygame.Surface:
+        """:return: The surface scaled by a factor, scaled only the first time that factor is used"""
+        return self.transforms.get(surface, scale)
+
+    def transformed(self, surface: pygame.Surface, scale: float, angle: float) -> pygame.Surface:
+        """:return: The surface scaled by a factor and rotated counterclockwise by about the angle in degrees"""
+        return self.transforms.get(surface, scale, angle)
+
+    def convert(self) -> None:
+        """Convert every image to the display's pixel format, call once after the display mode is set"""
+        if self.converted:
+            return
+        for name, surface in self.images.items():
+            self.images[name] = surface.convert_alpha()
+        self.flipped_images.clear()
+        self.transforms.clear()
+        self.converted = True
+
+    def memory_usage(self) -> int:
+        """:return: Bytes of pixel data held by the decoded images, their variants are counted by CACHES"""
+        return sum(
+            surface.get_width() * surface.get_height() * surface.get_bytesize() for surface in self.images.values()
+        )
+
+    def get_debug_info(self) -> str:
+        return (f"Assets: {len(self.images)}\n"
+                f"Asset memory: {self.memory_usage() / 1024:.1f}KB")
+
+
+ASSETS: AssetRegistry = AssetRegistry()
+
+
+@cached("Images", max_bytes=32 * 1024 * 1024)
 def load_image(
     path: str,
     transparent_colour: tuple[int, int, int] = None,
@@ -24,8 +121,9 @@ def load_image(
     height: float = None,
     nonce: str = None,
 ) -> pygame.Surface:
-    img: pygame.Surface = pygame.image.load(f"{BASE_IMAGE_PATH}{path}").convert_alpha()
+    img: pygame.Surface = ASSETS.image(path)
     if transparent_colour:
+        img = img.copy()
         img.set_colorkey(transparent_colour)
     if width or height:
         img = pygame.transform.scale(
@@ -38,7 +136,7 @@ def load_image(
     return img
 
 
-@lru_cache
+@cached("Image sets", max_entries=16)
 def load_images(
     path: str,
     colour_key: tuple[int, int, int] = None,
@@ -0,0 +1,135 @@
+import json
+
+import pygame
+
+RECORDING_VERSION = 1
+
+# Only the events the game reacts to are recorded, with the key or mouse button as their code
+RECORDED_EVENTS: dict[int, str] = {
+    pygame.QUIT: "",
+    pygame.MOUSEBUTTONDOWN: "button",
+    pygame.MOUSEBUTTONUP: "button",
+    pygame.KEYDOWN: "key",
+    pygame.KEYUP: "key",
+}
+
+
+class RecordedFrame:
+    __slots__ = ("delta_time", "events", "mouse_position")
+
+    def __init__(
+        self,
+        delta_time: float,
+        events: list[tuple[int, int]] = None,
+        mouse_position: tuple[float, float] = None,
+    ):
+        self.delta_time = delta_time
+        self.events: list[tuple[int, int]] = events if events is not None else []
+        self.mouse_position = mouse_position
+
+    def to_json(self) -> list:
+        # Frames without input are stored as a bare delta time
+        if not self.events and self.mouse_position is None:
+            return [self.delta_time]
+        return [self.delta_time, self.events, self.mouse_position]
+
+    @staticmethod
+    def from_json(value: list) -> "RecordedFrame":
+        if len(value) == 1:
+            return RecordedFrame(value[0])
+        mouse_position = tuple(value[2]) if value[2] is not None else None
+        return RecordedFrame(value[0], [tuple(event) for event in value[1]], mouse_position)
+
+    def to_events(self) -> list[pygame.event.Event]:
+        events = []
+        for event_type, code in self.events:
+            attribute = RECORDED_EVENTS[event_type]
+            events.append(pygame.event.Event(event_type, {attribute: code} if attribute else {}))
+        return events
+
+
+class InputRecording:
+    """
+    Everything that drives a game from the outside: the seed of its random number generator and the delta time,
+    input events and mouse position of every frame. Replaying it reproduces a session frame for frame.
+    Headless recordings have no input, their level up rewards were picked automatically.
+    """
+
+    def __init__(self, seed: int, headless: bool = False, frames: list[RecordedFrame] = None):
+        self.seed = seed
+        self.headless = headless
+        self.frames: list[RecordedFrame] = frames if frames is not None else []
+        self._last_mouse_position: tuple[float, float] | None = None
+
+    def record_delta_time(self, delta_time: float):
+        """Start a new frame"""
+        self.frames.append(RecordedFrame(delta_time))
+
+    def record_input(self, events: list[pygame.event.Event], mouse_position: tuple[float, float]):
+        frame = self.frames[-1]
+        for event in events:
+            if event.type not in RECORDED_EVENTS:
+                continue
+            attribute = RECORDED_EVENTS[event.type]
+            frame.events.append((event.type, getattr(event, attribute) if attribute else 0))
+
+        if mouse_position != self._last_mouse_position:
+            frame.mouse_position = mouse_position
+            self._last_mouse_position = mouse_position
+
+    def save(self, path: str):
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "version": RECORDING_VERSION,
+                    "seed": self.seed,
+                    "headless": self.headless,
+                    "frames": [frame.to_json() for frame in self.frames],
+                },
+                file,
+                separators=(",", ":"),
+            )
+
+    @staticmethod
+    def load(path: str) -> "InputRecording":
+        with open(path) as file:
+            data = json.load(file)
+        if data["version"] != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {data['version']}")
+        return InputRecording(
+            data["seed"],
+            data["headless"],
+            [RecordedFrame.from_json(frame) for frame in data["frames"]],
+        )
+
+
+class InputReplay:
+    """Plays back a recording one frame at a time"""
+
+    def __init__(self, recording: InputRecording):
+        self.recording = recording
+        self.frame_index = -1
+        self.mouse_position: tuple[float, float] = (0, 0)
+        self.stopped = False
+
+    @property
+    def finished(self) -> bool:
+        return self.stopped or self.frame_index + 1 >= len(self.recording.frames)
+
+    @property
+    def current(self) -> RecordedFrame:
+        return self.recording.frames[self.frame_index]
+
+    def next_delta_time(self) -> float:
+        """Advance to the next frame"""
+        self.frame_index += 1
+        return self.current.delta_time
+
+    def next_input(self) -> tuple[list[pygame.event.Event], tuple[float, float]]:
+        frame = self.current
+        if frame.mouse_position is not None:
+            self.mouse_position = frame.mouse_position
+        return frame.to_events(), self.mouse_position
+
+    def stop(self):
+        self.stopped = True
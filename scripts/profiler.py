@@ -0,0 +1,234 @@
+import json
+import time
+from collections import deque
+from typing import NamedTuple
+
+from pygame import Surface, SRCALPHA, draw
+
+from scripts.text_renderer import TEXT
+from scripts.readable_classes import XYInt
+
+GRAPH_COLOURS: tuple[tuple[int, int, int], ...] = (
+    (230, 25, 75),
+    (60, 180, 75),
+    (0, 130, 200),
+    (245, 130, 48),
+    (145, 30, 180),
+    (70, 240, 240),
+    (240, 50, 230),
+    (128, 128, 0),
+    (0, 128, 128),
+    (170, 110, 40),
+)
+
+
+class ScopeRecord(NamedTuple):
+    name: str
+    depth: int
+    start: int
+    end: int
+
+
+class FrameRecord(NamedTuple):
+    start: int
+    end: int
+    scopes: list[ScopeRecord]
+
+
+class _NullScope:
+    """Returned while the profiler is disabled so a scope costs a single attribute lookup"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "depth", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.depth = 0
+        self.start = 0
+
+    def __enter__(self):
+        self.depth = self.profiler.depth
+        self.profiler.depth += 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        end = time.perf_counter_ns()
+        self.profiler.depth -= 1
+        self.profiler.scopes.append(ScopeRecord(self.name, self.depth, self.start, end))
+        return False
+
+
+class _FrameScope:
+    __slots__ = ("profiler",)
+
+    def __init__(self, profiler: "FrameProfiler"):
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.profiler.begin_frame()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.end_frame()
+        return False
+
+
+class FrameProfiler:
+    """
+    Records named scopes for every frame into a ring buffer of the most recent frames
+
+    Usage:
+        with profiler.frame():
+            with profiler.scope("update_enemies"):
+                ...
+    """
+
+    def __init__(self, capacity: int = 4096, enabled: bool = False):
+        self.enabled: bool = enabled
+        self.frames: deque[FrameRecord] = deque(maxlen=capacity)
+        self.scopes: list[ScopeRecord] = []
+        self.depth: int = 0
+        self.frame_start: int = 0
+        self.frame_count: int = 0
+        self._frame_scope = _FrameScope(self)
+
+        # Scrolling frame time graph, only the newest frame is drawn each time
+        self.graph_size: XYInt = XYInt(600, 150)
+        self.graph_max_ms: float = 33.3
+        self.bar_width: int = 2
+        self.graph: Surface = Surface(self.graph_size.to_tuple(), SRCALPHA)
+        self.colours: dict[str, tuple[int, int, int]] = {}
+        self._graphed_frames: int = 0
+
+    def scope(self, name: str):
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def frame(self):
+        return self._frame_scope
+
+    def begin_frame(self):
+        self.scopes = []
+        self.depth = 0
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.frames.append(FrameRecord(self.frame_start, time.perf_counter_ns(), self.scopes))
+        self.frame_count += 1
+
+    def clear(self):
+        self.frames.clear()
+        self.graph.fill((0, 0, 0, 0))
+        self._graphed_frames = self.frame_count
+
+    def last_frame_totals(self) -> dict[str, float]:
+        """:return: Seconds spent in each scope of the last recorded frame, nested scopes included"""
+        totals: dict[str, float] = {}
+        if not self.frames:
+            return totals
+        for scope in self.frames[-1].scopes:
+            totals[scope.name] = totals.get(scope.name, 0.0) + (scope.end - scope.start) / 1e9
+        return totals
+
+    def colour(self, name: str) -> tuple[int, int, int]:
+        if name not in self.colours:
+            self.colours[name] = GRAPH_COLOURS[len(self.colours) % len(GRAPH_COLOURS)]
+        return self.colours[name]
+
+    def update_graph(self) -> Surface:
+        """Scroll the graph and draw the frames recorded since the last call as stacked top level scopes"""
+        new_frames = min(
+            self.frame_count - self._graphed_frames,
+            len(self.frames),
+            self.graph_size.x // self.bar_width,
+        )
+        self._graphed_frames = self.frame_count
+
+        for index in range(len(self.frames) - new_frames, len(self.frames)):
+            self._draw_bar(self.frames[index])
+        return self.graph
+
+    def _draw_bar(self, frame: FrameRecord):
+        width, height = self.graph_size.to_tuple()
+        pixels_per_ns = height / (self.graph_max_ms * 1e6)
+
+        self.graph.scroll(-self.bar_width, 0)
+        self.graph.fill((0, 0, 0, 160), (width - self.bar_width, 0, self.bar_width, height))
+
+        bottom = float(height)
+        for scope in frame.scopes:
+            if scope.depth != 0:
+                continue
+            top = max(0.0, bottom - (scope.end - scope.start) * pixels_per_ns)
+            if bottom - top >= 1:
+                draw.rect(
+                    self.graph,
+                    self.colour(scope.name),
+                    (width - self.bar_width, top, self.bar_width, bottom - top),
+                )
+            bottom = top
+
+        # Frame budget at 60 fps
+        budget = height - (1000 / 60) * 1e6 * pixels_per_ns
+        self.graph.fill((255, 255, 255), (width - self.bar_width, budget, self.bar_width, 1))
+
+    def draw_graph(self, surface: Surface, location: tuple[float, float]):
+        surface.blit(self.update_graph(), location)
+        for row, (name, colour) in enumerate(self.colours.items()):
+            TEXT.draw(
+                surface,
+                # The game font has no underscore
+                name.replace("_", " "),
+                (location[0] + self.graph_size.x + 10, location[1] + row * 20),
+                colour,
+                20,
+            )
+
+    def to_trace_events(self) -> dict:
+        """Chrome trace event format that Perfetto and chrome://tracing can load"""
+        events = []
+        for frame in self.frames:
+            events.append(
+                {
+                    "name": "frame",
+                    "ph": "X",
+                    "ts": frame.start / 1000,
+                    "dur": (frame.end - frame.start) / 1000,
+                    "pid": 1,
+                    "tid": 1,
+                }
+            )
+            for scope in frame.scopes:
+                events.append(
+                    {
+                        "name": scope.name,
+                        "ph": "X",
+                        "ts": scope.start / 1000,
+                        "dur": (scope.end - scope.start) / 1000,
+                        "pid": 1,
+                        "tid": 1,
+                        "args": {"depth": scope.depth},
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_trace(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_trace_events(), file)
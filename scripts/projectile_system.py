@@ -0,0 +1,99 @@
+from typing import TYPE_CHECKING, Iterator
+
+from scripts.renderer import LAYER_PROJECTILES
+from weapons.projectile_store import ProjectileStore
+
+if TYPE_CHECKING:
+    from entities.base_entity import BaseDrop
+    from entities.enemy_store import EnemyStore
+    from entities.player import Player
+    from scripts.camera import Camera
+    from scripts.collision_system import HighPerformanceCollisionSystem
+    from scripts.damage_numbers import DamageNumbers
+    from scripts.renderer import RenderQueue
+    from weapons.base_weapon import BaseAmmo, BaseWeapon
+
+
+class ProjectileSystem:
+    """
+    Owns every live projectile of every weapon
+
+    Each tick all projectiles are stepped together and checked for collisions in a single pass, hits are then handed
+    to the weapon that fired them. The projectiles live in a pooled ProjectileStore, which also records the weapon
+    of every slot so finding the owner and removing a projectile are O(1).
+    """
+
+    def __init__(self, damage_numbers: "DamageNumbers" = None):
+        self.store: ProjectileStore = ProjectileStore()
+        # Shows the damage of every hit, hits are not shown if None
+        self.damage_numbers: "DamageNumbers | None" = damage_numbers
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __iter__(self) -> Iterator["BaseAmmo"]:
+        return iter(self.store)
+
+    def acquire(self, ammo_class: type) -> "BaseAmmo | None":
+        """:return: A spent projectile of the class to reset for a new shot, or None"""
+        return self.store.acquire(ammo_class)
+
+    def add(self, ammo: "BaseAmmo", weapon: "BaseWeapon") -> None:
+        self.store.append(ammo, weapon)
+
+    def remove(self, ammo: "BaseAmmo") -> None:
+        self.store.remove(ammo)
+
+    def owner(self, ammo: "BaseAmmo") -> "BaseWeapon":
+        return self.store.owner(ammo)
+
+    def update(
+        self,
+        delta_time: float,
+        player: "Player",
+        enemies: "EnemyStore",
+        drops: list["BaseDrop"],
+        collision_system: "HighPerformanceCollisionSystem",
+    ) -> None:
+        """Move every projectile, drop the ones that arrived and resolve all hits with one collision pass"""
+        store = self.store
+        for ammo in store.step(delta_time):
+            store.remove(ammo)
+
+        if len(store) and len(enemies):
+            collisions = collision_system.check_all_collisions(list(store.ammo), store.bounds())
+            for ammo, enemy in collisions.items():
+                # An enemy killed by an earlier hit this tick lets the rest of the projectiles fly on
+                if enemy not in enemies:
+                    continue
+                weapon = store.owner(ammo)
+                store.remove(ammo)
+                weapon.handle_ammo_hit(ammo, enemy, enemies, drops, player, self.damage_numbers)
+
+    def draw(self, render_queue: "RenderQueue", alpha: float, camera: "Camera" = None) -> None:
+        """
+        Submit every projectile between its last two ticks
+        :param camera: View to cull and place the projectiles by, drawn at their world location if None
+        """
+        store = self.store
+        if camera is None:
+            render_queue.submit_many(
+                zip((ammo.surface for ammo in store.ammo), store.interpolated_locations(alpha)),
+                LAYER_PROJECTILES,
+            )
+            return
+
+        locations = store.interpolated(alpha)
+        visible = camera.cull(locations, store.draw_sizes())
+        render_queue.submit_many(
+            zip(
+                camera.scaled_all([store.ammo[index].surface for index in visible.tolist()]),
+                camera.to_screen(locations[visible]).tolist(),
+            ),
+            LAYER_PROJECTILES,
+        )
+
+    def get_debug_info(self) -> str:
+        pooled = sum(len(free) for free in self.store.free.values())
+        return (f"Projectiles: {len(self.store)}\n"
+                f"Pooled projectiles: {pooled}")
@@ -1,12 +1,13 @@
 import math
+import os
 from pygame import Surface, SRCALPHA, mouse, font, math as pmath, image
 from scripts.readable_classes import XYInt, XYFloat
 from scripts import config
-from functools import lru_cache
+from scripts.cache import cached
 from icecream import ic
 
 
-@lru_cache
+@cached("Surfaces", max_bytes=16 * 1024 * 1024)
 def create_surface(colour: tuple = None, size: XYInt = XYInt(80, 80)) -> Surface:
     new_surface: Surface = Surface((size.x, size.y), SRCALPHA)
     if colour is not None:
@@ -30,7 +31,7 @@ def get_selected_mask(size: XYInt, alpha: int = 10) -> Surface:
     return new_surface
 
 
-@lru_cache
+@cached("Font surfaces", max_bytes=8 * 1024 * 1024)
 def create_font_surface(
     text: str, colour: tuple[int, int, int] = (255, 255, 255), size: int = 20
 ) -> Surface:
@@ -49,6 +50,17 @@ def calculate_pathing(
     return XYFloat(next_location.x, next_location.y)
 
 
+def interpolate(
+    previous_location: XYFloat,
+    current_location: XYFloat,
+    alpha: float,
+) -> tuple[float, float]:
+    return (
+        previous_location.x + (current_location.x - previous_location.x) * alpha,
+        previous_location.y + (current_location.y - previous_location.y) * alpha,
+    )
+
+
 def calculate_distance(
     current_location: XYFloat,
     target_location: XYFloat,
@@ -102,11 +114,17 @@ def location_reached(
     return True
 
 
-@lru_cache
-def tile_background(surface: Surface, alternate_rows: bool = False) -> Surface:
+@cached("Backgrounds", max_entries=4, max_bytes=32 * 1024 * 1024)
+def tile_background(surface: Surface, alternate_rows: bool = False, size: XYInt = None) -> Surface:
+    """
+    Tile the surface into a background
+    :param size: Area to cover, the display if None
+    """
+    if size is None:
+        size = config.DISPLAY_SIZE
     tiles = XYInt(
-        math.ceil(config.DISPLAY_SIZE.x / surface.get_width()),
-        math.ceil(config.DISPLAY_SIZE.y / surface.get_height()),
+        math.ceil(size.x / surface.get_width()),
+        math.ceil(size.y / surface.get_height()),
     )
     background_surface = create_surface(
         size=XYInt(tiles.x * surface.get_width(), tiles.y * surface.get_height())
@@ -128,7 +146,7 @@ def tile_background(surface: Surface, alternate_rows: bool = False) -> Surface:
     return background_surface
 
 
-@lru_cache
+@cached("Fonts", max_entries=32)
 def default_font(size: int = 20):
     return font.Font("assets/PythonSurvivorsFont.ttf", size)
 
@@ -140,6 +158,7 @@ def log(text: str):
 
 
 def configure_icecream():
+    os.makedirs("logs", exist_ok=True)
     with open("logs/log.txt", "w") as file:
         file.write(f"")
     ic.configureOutput(
@@ -144,3 +144,23 @@ class PlayerMouse:
 
     def copy(self):
         return PlayerMouse(self.left_click, self.right_click)
+
+
+@dataclass(slots=True)
+class SimulationReport:
+    frames: int
+    simulated_time: float
+    wall_time: float
+    kills: int
+    player_alive: bool
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.wall_time if self.wall_time > 0 else 0.0
+
+    def __str__(self):
+        return (
+            f"Frames: {self.frames}\t|\tSimulated: {self.simulated_time:.2f}s\t|\t"
+            f"Wall: {self.wall_time:.2f}s\t|\tFPS: {self.fps:.1f}\t|\t"
+            f"Kills: {self.kills}\t|\tAlive: {self.player_alive}"
+        )
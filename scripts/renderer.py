@@ -0,0 +1,65 @@
+from typing import Iterable
+
+from pygame import Surface
+
+# Draw order of the world, lower layers are drawn first
+LAYER_DROPS = 0
+LAYER_ENEMIES = 1
+LAYER_PROJECTILES = 2
+LAYER_PLAYER = 3
+LAYER_DAMAGE_TEXT = 4
+LAYER_COUNT = 5
+
+
+class RenderQueue:
+    """
+    Collects every sprite of a frame and draws them in one place
+
+    Gameplay code submits (surface, position) pairs while the frame is built, flush then draws them layer by layer
+    with Surface.fblits, grouped by surface so sprites sharing a surface are drawn back to back.
+    """
+
+    def __init__(self, layers: int = LAYER_COUNT):
+        self.layers: list[dict[Surface, list[tuple[float, float]]]] = [{} for _ in range(layers)]
+        self.stats: dict[str, int] = {
+            'sprites': 0,
+            'surfaces': 0,
+            'blit_calls': 0,
+        }
+
+    def submit(self, surface: Surface, position: tuple[float, float], layer: int) -> None:
+        positions = self.layers[layer].get(surface)
+        if positions is None:
+            self.layers[layer][surface] = [position]
+        else:
+            positions.append(position)
+
+    def submit_many(self, sprites: Iterable[tuple[Surface, tuple[float, float]]], layer: int) -> None:
+        surfaces = self.layers[layer]
+        for surface, position in sprites:
+            positions = surfaces.get(surface)
+            if positions is None:
+                surfaces[surface] = [position]
+            else:
+                positions.append(position)
+
+    def flush(self, target: Surface) -> None:
+        """Draw and clear everything submitted since the last flush"""
+        sprites = surfaces = blit_calls = 0
+        for layer in self.layers:
+            if not layer:
+                continue
+            target.fblits([(surface, position) for surface, positions in layer.items() for position in positions])
+            blit_calls += 1
+            surfaces += len(layer)
+            sprites += sum(len(positions) for positions in layer.values())
+            layer.clear()
+
+        self.stats['sprites'] = sprites
+        self.stats['surfaces'] = surfaces
+        self.stats['blit_calls'] = blit_calls
+
+    def get_debug_info(self) -> str:
+        return (f"Sprites: {self.stats['sprites']}\n"
+                f"Sprite surfaces: {self.stats['surfaces']}\n"
+                f"Blit calls: {self.stats['blit_calls']}")
@@ -0,0 +1,133 @@
+from pygame import BLEND_RGBA_MAX, SRCALPHA, Surface
+
+from scripts.cache import CACHES
+from scripts.pygame_utils import default_font
+
+
+class GlyphAtlas:
+    """
+    Glyphs of one font size and colour, each rasterized once into shared sheets
+
+    Glyphs are shelf packed into sheets as they are first used and handed out as subsurfaces, so laying out text is
+    only blitting small regions. Like Font.render, lines are split on newlines and spaced by the font's line size.
+    """
+
+    SHEET_WIDTH: int = 512
+    SHEET_ROWS: int = 2
+    # Glyphs of huge fonts are few and kept on their own instead of reserving whole sheets for them
+    MAX_PACKED_HEIGHT: int = 128
+
+    def __init__(self, size: int, colour: tuple[int, int, int]):
+        self.font = default_font(size)
+        self.colour = colour
+        self.line_height: int = self.font.get_linesize()
+        self.glyphs: dict[str, Surface] = {}
+        # Horizontal advance of every glyph
+        self.advances: dict[str, int] = {}
+        self.sheets: list[Surface] = []
+        # Where the next glyph goes on the last sheet
+        self.cursor_x: int = 0
+        self.cursor_y: int = 0
+
+    def _rasterize(self, character: str) -> Surface:
+        rendered = self.font.render(character, True, self.colour)
+        width, height = rendered.get_size()
+        if width > self.SHEET_WIDTH or height > self.MAX_PACKED_HEIGHT:
+            return rendered
+
+        if not self.sheets or self.cursor_x + width > self.SHEET_WIDTH:
+            self.cursor_x = 0
+            self.cursor_y += self.line_height
+            if not self.sheets or self.cursor_y + height > self.sheets[-1].get_height():
+                self.sheets.append(Surface((self.SHEET_WIDTH, self.line_height * self.SHEET_ROWS), SRCALPHA))
+                self.cursor_y = 0
+
+        sheet = self.sheets[-1]
+        sheet.blit(rendered, (self.cursor_x, self.cursor_y))
+        glyph = sheet.subsurface((self.cursor_x, self.cursor_y, width, height))
+        self.cursor_x += width
+        return glyph
+
+    def glyph(self, character: str) -> Surface:
+        if (glyph := self.glyphs.get(character)) is None:
+            glyph = self.glyphs[character] = self._rasterize(character)
+            self.advances[character] = self.font.size(character)[0]
+        return glyph
+
+    def layout(self, text: str) -> tuple[list[tuple[Surface, tuple[int, int]]], tuple[int, int]]:
+        """:return: The glyph and position of every character of the text, and the size of the whole text"""
+        glyphs = []
+        width = 0
+        lines = text.split("\n")
+        for row, line in enumerate(lines):
+            x = 0
+            y = row * self.line_height
+            for character in line:
+                glyphs.append((self.glyph(character), (x, y)))
+                x += self.advances[character]
+            width = max(width, x)
+        return glyphs, (width, len(lines) * self.line_height)
+
+    def memory_usage(self) -> int:
+        """:return: Bytes of pixel data held by the sheets and the glyphs kept on their own"""
+        surfaces = [*self.sheets, *(glyph for glyph in self.glyphs.values() if glyph.get_parent() is None)]
+        return sum(surface.get_width() * surface.get_height() * surface.get_bytesize() for surface in surfaces)
+
+
+class TextRenderer:
+    """
+    Draws text from glyph atlases instead of rasterizing every new string with the font
+
+    One GlyphAtlas is kept per font size and colour, so text that changes every frame such as counters and timers
+    only costs a blit per character once its glyphs have been seen.
+    """
+
+    def __init__(self, name: str = "Glyph atlases"):
+        self.name = name
+        self.atlases: dict[tuple[int, tuple[int, int, int]], GlyphAtlas] = {}
+
+    def atlas(self, size: int, colour: tuple[int, int, int]) -> GlyphAtlas:
+        key = (size, tuple(colour))
+        if (atlas := self.atlases.get(key)) is None:
+            atlas = self.atlases[key] = GlyphAtlas(size, key[1])
+        return atlas
+
+    def render(self, text: str, colour: tuple[int, int, int] = (255, 255, 255), size: int = 20) -> Surface:
+        """:return: A new surface with the text, like create_font_surface"""
+        glyphs, text_size = self.atlas(size, colour).layout(text)
+        surface = Surface(text_size, SRCALPHA)
+        # Glyphs are copied as they are rather than blended onto the empty surface
+        surface.fblits(glyphs, BLEND_RGBA_MAX)
+        return surface
+
+    def draw(
+        self,
+        target: Surface,
+        text: str,
+        location: tuple[float, float],
+        colour: tuple[int, int, int] = (255, 255, 255),
+        size: int = 20,
+    ) -> tuple[int, int]:
+        """
+        Draw the text straight onto the target without an intermediate surface
+        :return: The size of the text
+        """
+        glyphs, text_size = self.atlas(size, colour).layout(text)
+        x, y = location
+        target.fblits([(glyph, (x + glyph_x, y + glyph_y)) for glyph, (glyph_x, glyph_y) in glyphs])
+        return text_size
+
+    @property
+    def bytes(self) -> int:
+        return sum(atlas.memory_usage() for atlas in self.atlases.values())
+
+    def clear(self) -> None:
+        self.atlases.clear()
+
+    def get_debug_info(self) -> str:
+        return (f"{self.name}: {len(self.atlases)}, "
+                f"{sum(len(atlas.glyphs) for atlas in self.atlases.values())} glyphs, {self.bytes / 1024:.0f}KB")
+
+
+TEXT: TextRenderer = TextRenderer()
+CACHES.register(TEXT)
@@ -1,9 +1,9 @@
-from functools import lru_cache
-
 from pygame import Surface
 from entities.base_entity import BaseEntity
 from scripts.readable_classes import XYFloat, XYInt, PlayerMouse
-from scripts.pygame_utils import create_surface, create_font_surface, time_to_string, calculate_inner_picture_size
+from scripts.pygame_utils import create_surface, time_to_string, calculate_inner_picture_size
+from scripts.text_renderer import TEXT
+from scripts.cache import cached_method
 from scripts.config import DISPLAY_SIZE
 from typing import TYPE_CHECKING, Callable
 import random
@@ -13,6 +13,13 @@ if TYPE_CHECKING:
 
 
 class BaseUIElement(BaseEntity):
+    """
+    Element of the overlay, drawn on top of its base surface together with its layers
+
+    The composited surface is kept until the element or one of its layers is marked dirty, elements only do so when
+    what they show changes, so an unchanged overlay is one blit per top level element.
+    """
+
     def __init__(
         self,
         name: str,
@@ -27,6 +34,21 @@ class BaseUIElement(BaseEntity):
         self.base_surface = self.surface
         self.layers: list[BaseUIElement] = []
         self.parent_location = parent_location if parent_location else XYFloat(0, 0)
+        self.composited: Surface | None = None
+
+    @property
+    def layers(self) -> list["BaseUIElement"]:
+        return self._layers
+
+    @layers.setter
+    def layers(self, layers: list["BaseUIElement"]):
+        self._layers = layers
+        self.dirty = True
+
+    @property
+    def is_dirty(self) -> bool:
+        """:return: If the element or any of its layers changed since it was last composited"""
+        return self.dirty or any(layer.is_dirty for layer in self._layers)
 
     @property
     def absolute_location(self):
@@ -42,13 +64,15 @@ class BaseUIElement(BaseEntity):
 
     @full_surface.getter
     def full_surface(self):
-        try:
-            new_surface = self.base_surface.copy()
-        except AttributeError:
+        if self.base_surface is None or not self._layers:
+            self.dirty = False
             return self.surface
-        for layer in self.layers:
-            new_surface.blit(layer.full_surface, layer.location)
-        return new_surface
+        if self.composited is None or self.is_dirty:
+            self.composited = self.base_surface.copy()
+            for layer in self._layers:
+                self.composited.blit(layer.full_surface, layer.location)
+            self.dirty = False
+        return self.composited
 
     def update(self, *args, **kwargs):
         for layer in self.layers:
@@ -73,6 +97,7 @@ class HotBarUIElement(BaseUIElement):
         self.title_text = title_text
         self.base_surface = self.background().surface.copy()
         self.player = player
+        self.amount_text: str | None = None
         self.update()
 
         super().__init__(name, self.base_surface, location, player, parent_location=parent_location)
@@ -82,25 +107,29 @@ class HotBarUIElement(BaseUIElement):
         *args,
         **kwargs,
     ):
-        self.layers = [
-            self.background(),
-            self.title(),
-            self.amount(),
-        ]
-
-    @lru_cache
+        # Only rebuilt when the amount shown changes
+        amount_text = self.determine_amount()
+        if amount_text != self.amount_text or not self.layers:
+            self.amount_text = amount_text
+            self.layers = [
+                self.background(),
+                self.title(),
+                self.amount(),
+            ]
+
+    @cached_method("HotBar backgrounds", max_entries=64)
     def background(self) -> BaseUIElement:
         background_surface = create_surface(size=self.size, colour=(100, 100, 100))
         return BaseUIElement(surface=background_surface, location=XYFloat(0, 0),
                              name=self.name if hasattr(self, 'name') else None)
 
-    @lru_cache
+    @cached_method("HotBar titles", max_entries=64, max_bytes=4 * 1024 * 1024)
     def title_surface(self):
-        return create_font_surface(
+        return TEXT.render(
             text=self.title_text, size=35, colour=(200, 200, 200)
         )
 
-    @lru_cache
+    @cached_method("HotBar title elements", max_entries=64)
     def title(self) -> BaseUIElement:
         font_surface = self.title_surface()
         location = XYFloat(
@@ -114,8 +143,8 @@ class HotBarUIElement(BaseUIElement):
         )
 
     def amount_surface(self) -> Surface:
-        return create_font_surface(
-            text=self.determine_amount(), size=45, colour=(200, 200, 200)
+        return TEXT.render(
+            text=self.amount_text, size=45, colour=(200, 200, 200)
         )
 
     def amount(self) -> BaseUIElement:
@@ -209,7 +238,7 @@ class Resources(BaseUIElement):
 
 class PauseMenu(BaseUIElement):
     def __init__(self):
-        self.text_surface = create_font_surface(
+        self.text_surface = TEXT.render(
             text="Paused", size=400, colour=(0, 0, 0)
         )
         surface = create_surface(
@@ -247,30 +276,24 @@ class TimeClock(BaseUIElement):
         )
         super().__init__("TimeClock", surface, location)
         self.logging = False
+        self.text: str | None = None
 
-    @staticmethod
-    @lru_cache(maxsize=1)
-    def _cached_surface(total_time: float):
-        return create_font_surface(
-            text=time_to_string(total_time), size=40, colour=(0, 0, 0)
-        )
-
-    @lru_cache(maxsize=1)
-    def _cached_element(self, text_surface: Surface):
-        return BaseUIElement(
+    def update(self, *args, total_time: float = 0, **kwargs):
+        # The clock only changes once a second
+        text = time_to_string(total_time)
+        if text == self.text:
+            return
+        self.text = text
+        text_surface = TEXT.render(text=text, size=40, colour=(0, 0, 0))
+        self.layers = [
+            BaseUIElement(
                 surface=text_surface,
                 location=XYFloat(
                     (self.surface.get_width() - text_surface.get_width()) // 2,
                     0,
                 ),
                 name=self.name,
-            )
-
-    @lru_cache(maxsize=10)
-    def update(self, *args, total_time: float = 0, **kwargs):
-        text_surface = self._cached_surface(total_time)
-        self.layers = [
-            self._cached_element(text_surface),
+            ),
         ]
 
 
@@ -280,7 +303,16 @@ class Button(HotBarUIElement):
 
 
 class LevelOption(Button):
-    def __init__(self, size: XYInt, location: XYFloat, player: 'Player', parent_location: XYFloat, **kwargs):
+    def __init__(
+            self,
+            size: XYInt,
+            location: XYFloat,
+            player: 'Player',
+            parent_location: XYFloat,
+            rng: random.Random = None,
+            **kwargs,
+    ):
+        self.rng = rng if rng is not None else random.Random()
         self.reward: Callable | None = None
         self.reward_description: str = ""
         self.player = player
@@ -381,7 +413,7 @@ class LevelOption(Button):
             }
         }
 
-        reward_name = random.choice(list(rewards.keys()))
+        reward_name = self.rng.choice(list(rewards.keys()))
         reward_data = rewards[reward_name]
 
         self.title_text = reward_data['title']
@@ -391,7 +423,8 @@ class LevelOption(Button):
 
 
 class LevelMenu(BaseUIElement):
-    def __init__(self, player: 'Player'):
+    def __init__(self, player: 'Player', rng: random.Random = None):
+        self.rng = rng
         self.border = 5
         self.rows = 1
         size = XYInt(
@@ -421,10 +454,11 @@ class LevelMenu(BaseUIElement):
             ),
             player=self.player,
             parent_location=self.location,
+            rng=self.rng,
         )
 
     def determine_options(self, level: int):
-        # Remove @lru_cache to generate fresh options each level
+        # Not cached so fresh options are generated each level
         self.layers = []
         for _ in range(self.player.level_options):
             self.layers.append(self.get_option())
@@ -435,13 +469,16 @@ class LevelMenu(BaseUIElement):
             self.determine_options(int(self.player.level))
         super().update()
 
+    def choose(self, option: LevelOption):
+        self.choice_made = True
+        self.player.recently_leveled_up = False
+        option.reward()
+
     def clicked(self, location: XYInt, *args, **kwargs):
         for option in self.layers:
             if option.absolute_location.x <= location.x <= option.absolute_location.x + option.size.x:
                 if option.absolute_location.y <= location.y <= option.absolute_location.y + option.size.y:
-                    self.choice_made = True
-                    self.player.recently_leveled_up = False
-                    option.reward()
+                    self.choose(option)
                     return True
         return False
 
@@ -455,30 +492,23 @@ class Kills(BaseUIElement):
         surface = create_surface(size=size)
         super().__init__("Kills", surface, location)
         self._location = location.copy()
-
-    @staticmethod
-    @lru_cache(maxsize=1)
-    def _cached_surface(kills: int):
-        return create_font_surface(
-            text=f"Kills: {kills}", size=40, colour=(0, 0, 0)
-        )
-
-    @lru_cache(maxsize=1)
-    def _cached_element(self, text_surface: Surface):
-        return BaseUIElement(
-            surface=text_surface,
-            location=XYFloat(
-                0,
-                (self.surface.get_height() - text_surface.get_height()) // 2,
-            ),
-            name=self.name,
-        )
+        self.kills: int | None = None
 
     def update(self, *args, kills: int = 0, **kwargs):
-        text_surface = self._cached_surface(kills)
+        if kills == self.kills:
+            return
+        self.kills = kills
+        text_surface = TEXT.render(text=f"Kills: {kills}", size=40, colour=(0, 0, 0))
         self.location.x = self._location.x - text_surface.get_width()
         self.layers = [
-            self._cached_element(text_surface),
+            BaseUIElement(
+                surface=text_surface,
+                location=XYFloat(
+                    0,
+                    (self.surface.get_height() - text_surface.get_height()) // 2,
+                ),
+                name=self.name,
+            ),
         ]
 
 
@@ -488,9 +518,11 @@ class Overlay:
         game_display: Surface,
         player: "Player",
         paused: bool,
+        rng: random.Random = None,
     ):
         self.game_display = game_display
         self.player = player
+        self.rng = rng
         self.previously_paused = paused
         self.previously_level_up = False
 
@@ -534,13 +566,21 @@ class Overlay:
         )
 
     def update(self, paused: bool, total_time: float, kills: int, player_mouse: PlayerMouse):
+        paused = self.update_state(paused, player_mouse)
+        self.draw(total_time, kills)
+        return paused
+
+    def update_state(self, paused: bool, player_mouse: PlayerMouse) -> bool:
+        """Handle clicks and show or hide the menus, without drawing anything"""
         if player_mouse.left_click:
             self.click(player_mouse.mouse_position)
 
         # If the player is choosing an option when leveling up
         if self.player.recently_leveled_up and (not self.level_menu or self.level_menu not in self.layers):
-            # Create fresh menu for new level options
-            self.level_menu = LevelMenu(self.player)
+            # Create fresh menu for new level options, built right away so headless games that never draw the
+            # overlay draw the same random rewards and can click them
+            self.level_menu = LevelMenu(self.player, self.rng)
+            self.level_menu.determine_options(int(self.player.level))
             self.layers.append(self.level_menu)
             paused = True
         elif self.level_menu in self.layers and self.level_menu.choice_made:
@@ -556,15 +596,15 @@ class Overlay:
         elif not paused and self.pause_menu in self.layers:
             self.layers.remove(self.pause_menu)
         self.previously_paused = paused
+        return paused
 
+    def draw(self, total_time: float, kills: int):
         for layer in self.layers:
             layer.update(total_time=total_time, kills=kills)
             if layer.logging:
                 layer.log()
             self.game_display.blit(layer.full_surface, layer.location)
 
-        return paused
-
     def click(self, location: XYFloat):
         for layer in self.layers:
             if layer.clicked(location):
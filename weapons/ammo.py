@@ -1,8 +1,9 @@
 from scripts.readable_classes import XYFloat, XYInt
 from weapons.base_weapon import BaseAmmo, BaseEffect
-from pygame import Surface, image
+from pygame import Surface
 from scripts.config import BASE_SPEED
 from scripts.pygame_utils import create_surface
+from scripts.file_handler import ASSETS
 
 
 class Normal(BaseAmmo):
@@ -17,7 +18,7 @@ class Normal(BaseAmmo):
         size: float = 1
     ):
         if surface is None:
-            surface = image.load("assets/ammo.png")
+            surface = ASSETS.image("ammo.png")
 
         if effects is None:
             effects = []
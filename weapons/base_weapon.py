@@ -1,21 +1,22 @@
-import pygame.transform
 from pygame import Surface, FRect
 from entities.enemy import Enemy
 from scripts.readable_classes import XYFloat
 from scripts.pygame_utils import (
-    calculate_pathing,
     calculate_distance,
-    location_reached,
     line_set_distance,
 )
-from scripts.animation import Animation
+from scripts.file_handler import ASSETS
 from entities.base_entity import BaseDrop
 from icecream import ic
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, NamedTuple, SupportsIndex
+from math import atan2, degrees
 
 if TYPE_CHECKING:
     from entities.player import Player
-    from scripts.collision_system import WeaponCollisionHelper
+    from scripts.collision_system import HighPerformanceCollisionSystem
+    from scripts.projectile_system import ProjectileSystem
+    from weapons.projectile_store import ProjectileStore
+    from scripts.damage_numbers import DamageNumbers
 
 
 class BaseEffect:
@@ -32,7 +33,98 @@ class BaseEffect:
         self.ammo_speed_multiplier = ammo_speed_multiplier
 
 
+class CompiledEffects(NamedTuple):
+    """Every effect of a list folded into totals, flat bonuses are added before the multipliers apply"""
+
+    damage_flat_bonus: float = 0
+    damage_multiplier: float = 1
+    ammo_speed_flat_bonus: float = 0
+    ammo_speed_multiplier: float = 1
+
+    @staticmethod
+    def compile(effects: Iterable[BaseEffect]) -> "CompiledEffects":
+        damage_flat_bonus = ammo_speed_flat_bonus = 0
+        damage_multiplier = ammo_speed_multiplier = 1
+        for effect in effects:
+            if effect.damage_flat_bonus is not None:
+                damage_flat_bonus += effect.damage_flat_bonus
+            if effect.damage_multiplier is not None:
+                damage_multiplier *= effect.damage_multiplier
+            if effect.ammo_speed_flat_bonus is not None:
+                ammo_speed_flat_bonus += effect.ammo_speed_flat_bonus
+            if effect.ammo_speed_multiplier is not None:
+                ammo_speed_multiplier *= effect.ammo_speed_multiplier
+        return CompiledEffects(damage_flat_bonus, damage_multiplier, ammo_speed_flat_bonus, ammo_speed_multiplier)
+
+
+class EffectList(list):
+    """
+    List of effects that keeps its CompiledEffects up to date
+
+    Any change to the list marks it dirty and the totals are recompiled on the next read of compiled, so every
+    projectile sharing the list shares one compiled result. Effects must not be changed once they are in the list.
+    """
+
+    def __init__(self, effects: Iterable[BaseEffect] = ()):
+        super().__init__(effects)
+        self._compiled: CompiledEffects | None = None
+
+    @property
+    def compiled(self) -> CompiledEffects:
+        if self._compiled is None:
+            self._compiled = CompiledEffects.compile(self)
+        return self._compiled
+
+    def _changed(self):
+        self._compiled = None
+
+    def append(self, effect: BaseEffect):
+        super().append(effect)
+        self._changed()
+
+    def extend(self, effects: Iterable[BaseEffect]):
+        super().extend(effects)
+        self._changed()
+
+    def insert(self, index: SupportsIndex, effect: BaseEffect):
+        super().insert(index, effect)
+        self._changed()
+
+    def remove(self, effect: BaseEffect):
+        super().remove(effect)
+        self._changed()
+
+    def pop(self, index: SupportsIndex = -1) -> BaseEffect:
+        effect = super().pop(index)
+        self._changed()
+        return effect
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, effects: Iterable[BaseEffect]):
+        self.extend(effects)
+        return self
+
+    def __imul__(self, count: SupportsIndex):
+        result = super().__imul__(count)
+        self._changed()
+        return result
+
+
 class BaseAmmo:
+    # Turn the sprite towards the target, sprites are drawn pointing right
+    directional: bool = True
+
     def __init__(
         self,
         target_location: XYFloat,
@@ -43,69 +135,94 @@ class BaseAmmo:
         effects: list[BaseEffect],
         size: float = 1,
     ):
-        self.base_damage = base_damage
-        self.base_ammo_speed = base_ammo_speed
-        self.surface = pygame.transform.scale(surface, (size * XYFloat.from_tuple(surface.get_size())).to_tuple())
-        self.base_surface = surface.copy()
-        self._base_surface_size = surface.get_size()
-        self.effects = effects
+        # Once added to a ProjectileStore the ammo is a view into the store's arrays
+        self.store: "ProjectileStore | None" = None
+        self.index: int = -1
+
+        # Kept so a pooled projectile can be reset to how it was created
+        self.initial_damage = base_damage
+        self.initial_ammo_speed = base_ammo_speed
+
+        self.base_surface = surface
+        self.reset(target_location, current_location, effects, size)
+
+    def reset(self, target_location: XYFloat, current_location: XYFloat, effects: list[BaseEffect], size: float = 1):
+        """Set up the projectile for a new shot, reusing its surfaces when it comes out of the pool"""
+        self.base_damage = self.initial_damage
+        self.base_ammo_speed = self.initial_ammo_speed
+        # The hitbox keeps the unrotated size so turning the sprite does not change what it hits
+        scaled = ASSETS.scaled(self.base_surface, size)
+        self.hitbox_size: tuple[int, int] = scaled.get_size()
+        if self.directional and target_location != current_location:
+            offset = target_location - current_location
+            self.surface = ASSETS.transformed(self.base_surface, size, degrees(atan2(-offset.y, offset.x)))
+        else:
+            self.surface = scaled
+        # Rotated sprites are larger than the hitbox and drawn centred on it
+        self.draw_offset: tuple[float, float] = (
+            (self.surface.get_width() - self.hitbox_size[0]) / 2,
+            (self.surface.get_height() - self.hitbox_size[1]) / 2,
+        )
+        # Shared with the weapon so its compiled effects are too
+        self.effects: EffectList = effects if isinstance(effects, EffectList) else EffectList(effects)
 
         self.target_location = target_location
-        self.current_location = current_location - XYFloat.from_tuple(self.surface.get_size()) / 2
+        self.current_location = current_location - XYFloat.from_tuple(self.hitbox_size) / 2
+        # Location at the previous simulation tick, used to interpolate rendering between ticks
+        self.previous_location = self.current_location
         self.size = size
 
-    @property
-    def damage(self) -> float:
-        damage = self.base_damage
-        for effect in self.effects:
-            if effect.damage_flat_bonus is not None:
-                damage += effect.damage_flat_bonus
+    def attach(self, store: "ProjectileStore", index: int):
+        self.store = store
+        self.index = index
 
-        for effect in self.effects:
-            if effect.damage_multiplier is not None:
-                damage *= effect.damage_multiplier
-
-        return damage
+    def detach(self):
+        """Copy the state out of the store so the ammo keeps working after being removed from it"""
+        current_location, previous_location = self.current_location, self.previous_location
+        self.store = None
+        self.index = -1
+        self.current_location, self.previous_location = current_location, previous_location
 
     @property
-    def ammo_speed(self) -> float:
-        ammo_speed = self.base_ammo_speed
-        for effect in self.effects:
-            if effect.ammo_speed_flat_bonus is not None:
-                ammo_speed += effect.ammo_speed_flat_bonus
-
-        for effect in self.effects:
-            if effect.ammo_speed_multiplier is not None:
-                ammo_speed *= effect.ammo_speed_multiplier
-
-        return ammo_speed
+    def current_location(self) -> XYFloat:
+        if self.store is None:
+            return self._current_location
+        return XYFloat.from_tuple(self.store.locations[self.index].tolist())
+
+    @current_location.setter
+    def current_location(self, value: XYFloat):
+        if self.store is None:
+            self._current_location = value
+        else:
+            self.store.locations[self.index] = value.to_tuple()
 
+    @property
+    def previous_location(self) -> XYFloat:
+        if self.store is None:
+            return self._previous_location
+        return XYFloat.from_tuple(self.store.previous_locations[self.index].tolist())
+
+    @previous_location.setter
+    def previous_location(self, value: XYFloat):
+        if self.store is None:
+            self._previous_location = value
+        else:
+            self.store.previous_locations[self.index] = value.to_tuple()
 
-    def location_reached(self, delta_time: float) -> bool:
-        """
-        Update the projectile location
-        :param delta_time:
-        :return: If the projectile arrived at the target
-        """
-        if location_reached(
-            self.current_location,
-            self.target_location,
-            self.base_ammo_speed,
-            delta_time,
-        ):
-            return True
-
-        self.current_location = calculate_pathing(
-            self.current_location,
-            self.target_location,
-            self.base_ammo_speed,
-            delta_time,
-        )
+    @property
+    def damage(self) -> float:
+        effects = self.effects.compiled
+        return (self.base_damage + effects.damage_flat_bonus) * effects.damage_multiplier
 
-        return False
+    @property
+    def ammo_speed(self) -> float:
+        effects = self.effects.compiled
+        return (self.base_ammo_speed + effects.ammo_speed_flat_bonus) * effects.ammo_speed_multiplier
 
     def get_rect(self) -> FRect:
-        return FRect(self.current_location.to_tuple(), self.surface.get_rect().size)
+        if self.store is None:
+            return FRect(self.current_location.to_tuple(), self.hitbox_size)
+        return FRect(self.store.locations[self.index].tolist(), self.store.sizes[self.index].tolist())
 
     def effect_enemy(self, enemy: Enemy):
         ic(f"Hit: {enemy.__class__.__name__}\t|\tDamage: {self.damage}")
@@ -136,103 +253,22 @@ class BaseWeapon:
 
         self.ammo = ammo
         self.ammo_instance = ammo(XYFloat(0, 0), XYFloat(0, 0))
-        self.active_ammo: list[BaseAmmo] = []
-        self.damage_text: list[Animation] = []
-
-        self.effects: list[BaseEffect] = effects
-
-    def update(
-        self,
-        delta_time: float,
-        player: "Player",
-        enemies: list[Enemy],
-        game_display: Surface,
-        drops: list[BaseDrop],
-    ) -> None:
-        """Legacy update method - kept for backwards compatibility"""
-        if self.current_cooldown > 0:
-            self.current_cooldown = max(self.current_cooldown - delta_time, 0)
-        else:
-            self.fire_weapon(player.location_center, enemies)
 
-        for ammo in self.active_ammo.copy():
-            game_display.blit(ammo.surface, ammo.current_location)
+        self.effects: EffectList = EffectList(effects)
 
-            if delta_time == 0:
-                continue
-            elif ammo.location_reached(delta_time):
-                self.active_ammo.remove(ammo)
-            elif enemy := self.hit_enemy(ammo, enemies):
-                self.active_ammo.remove(ammo)
-
-                ammo.effect_enemy(enemy)
-
-                damage_animation = enemy.damage_font.render(
-                    str(ammo.damage), True, (0, 0, 0)
-                )
-                self.damage_text.append(
-                    Animation(damage_animation, 0.25, location=enemy.location)
-                )
-
-                if enemy.health <= 0:
-                    if drop := enemy.die():
-                        drops.append(drop)
-                    enemies.remove(enemy)
-                    player.kills += 1
-
-        for animation in self.damage_text.copy():
-            if next_frame := animation.next_frame(delta_time):
-                game_display.blit(next_frame, animation.location.to_tuple())
-            else:
-                self.damage_text.remove(animation)
-
-    def update_with_collision_system(
+    def update_cooldown(
             self,
             delta_time: float,
             player: "Player",
             enemies: list[Enemy],
-            game_display: Surface,
-            drops: list[BaseDrop],
-            collision_helper: "WeaponCollisionHelper",
+            projectile_system: "ProjectileSystem",
+            collision_system: "HighPerformanceCollisionSystem" = None,
     ) -> None:
-        """New update method using the collision system"""
-        # Handle weapon cooldown and firing
+        """Count down the cooldown and hand a new projectile to the projectile system once it is over"""
         if self.current_cooldown > 0:
             self.current_cooldown = max(self.current_cooldown - delta_time, 0)
-        else:
-            self.fire_weapon(player, enemies)
-
-        # Register all active ammo with the collision system
-        collision_helper.register_ammo(self.active_ammo)
-
-        # Update ammo positions and render them
-        for ammo in self.active_ammo.copy():
-            game_display.blit(ammo.surface, ammo.current_location.to_tuple())
-
-            if delta_time == 0:
-                continue
-
-            # Check if ammo has reached its target location
-            if ammo.location_reached(delta_time):
-                self.active_ammo.remove(ammo)
-                continue
-
-        # Process collisions after all weapons have registered their ammo
-        # This is called once per frame in the game loop
-        if collision_helper.all_ammo:  # Only process if there's ammo to check
-            collision_results = collision_helper.process_all_collisions()
-
-            # Handle collision results
-            for ammo, enemy in collision_results.items():
-                if ammo in self.active_ammo:  # Make sure this weapon owns this ammo
-                    self.handle_ammo_hit(ammo, enemy, enemies, drops, player)
-
-        # Update damage text animations
-        for animation in self.damage_text.copy():
-            if next_frame := animation.next_frame(delta_time):
-                game_display.blit(next_frame, animation.location.to_tuple())
-            else:
-                self.damage_text.remove(animation)
+        elif new_projectile := self.create_projectile(player, enemies, collision_system, projectile_system):
+            projectile_system.add(new_projectile, self)
 
     def handle_ammo_hit(
             self,
@@ -240,20 +276,18 @@ class BaseWeapon:
             enemy: Enemy,
             enemies: list[Enemy],
             drops: list[BaseDrop],
-            player: "Player"
+            player: "Player",
+            damage_numbers: "DamageNumbers" = None,
     ):
-        """Handle what happens when ammo hits an enemy"""
-        self.active_ammo.remove(ammo)
-
+        """
+        Handle what happens when ammo hits an enemy, the ammo has already been removed by the projectile system
+        :param damage_numbers: Where to show the damage dealt, not shown if None
+        """
+        damage = ammo.damage
         ammo.effect_enemy(enemy)
 
-        # Create damage text animation
-        damage_animation = enemy.damage_font.render(
-            str(int(ammo.damage)), True, (0, 0, 0)
-        )
-        self.damage_text.append(
-            Animation(damage_animation, 0.25, location=enemy.location)
-        )
+        if damage_numbers is not None:
+            damage_numbers.add(enemy, damage, enemy.location.to_tuple())
 
         # Handle enemy death
         if enemy.health <= 0:
@@ -263,36 +297,60 @@ class BaseWeapon:
                 enemies.remove(enemy)
                 player.kills += 1
 
-    @staticmethod
-    def hit_enemy(ammo: BaseAmmo, enemies: list[Enemy]) -> Enemy | None:
-        """Legacy collision detection - kept for backwards compatibility"""
-        for enemy in enemies:
-            if ammo.get_rect().colliderect(enemy.get_rect()):
-                return enemy
+    def create_projectile(
+            self,
+            player: 'Player',
+            enemies: list[Enemy],
+            collision_system: "HighPerformanceCollisionSystem" = None,
+            projectile_system: "ProjectileSystem" = None,
+    ) -> BaseAmmo | None:
+        """
+        :param projectile_system: Pool to reuse a spent projectile from instead of creating a new one
+        :return: A projectile fired at the closest enemy in range, restarting the cooldown, or None
+        """
+        player_location = player.location_center
+        if target_location := self.get_closest_enemy_location(player_location, enemies, collision_system):
+            self.current_cooldown = self.cooldown
+            projectile_target = line_set_distance(player_location.copy(), target_location.copy(), self.attack_range)
+            return self.spawn_projectile(projectile_target, player, projectile_system)
         return None
 
-    def fire_weapon(self, player: 'Player', enemies: list[Enemy]):
+    def spawn_projectile(
+            self,
+            target_location: XYFloat,
+            player: 'Player',
+            projectile_system: "ProjectileSystem" = None,
+    ) -> BaseAmmo:
+        """
+        :param projectile_system: Pool to reuse a spent projectile from instead of creating a new one
+        :return: A projectile from the player flying to the target, not yet added to the projectile system
+        """
         player_location = player.location_center
-        if target_location := self.get_closest_enemy_location(player_location, enemies):
-            self.current_cooldown = self.cooldown
+        if projectile_system is not None and (new_projectile := projectile_system.acquire(self.ammo)):
+            new_projectile.reset(target_location, player_location.copy(), self.effects, player.ammo_size)
+        else:
             # noinspection PyCallingNonCallable
             new_projectile = self.ammo(
-                target_location=line_set_distance(
-                    player_location.copy(),
-                    target_location.copy(),
-                    self.attack_range,
-                ),
+                target_location=target_location,
                 current_location=player_location.copy(),
                 effects=self.effects,
                 size=player.ammo_size,
             )
-            new_projectile.base_damage *= self.damage_multiplier
-            new_projectile.base_ammo_speed *= self.ammo_speed_multiplier
-            self.active_ammo.append(new_projectile)
+        new_projectile.base_damage *= self.damage_multiplier
+        new_projectile.base_ammo_speed *= self.ammo_speed_multiplier
+        return new_projectile
 
     def get_closest_enemy_location(
-        self, player_location: XYFloat, enemies: list[Enemy]
+        self,
+        player_location: XYFloat,
+        enemies: list[Enemy],
+        collision_system: "HighPerformanceCollisionSystem" = None,
     ) -> XYFloat | None:
+        if collision_system is not None:
+            if closest := collision_system.query_nearest(player_location, 1, self.attack_range):
+                return closest[0].location_center
+            return None
+
         closest_enemy: Enemy | None = None
 
         for enemy in enemies:
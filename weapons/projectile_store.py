@@ -0,0 +1,150 @@
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from weapons.base_weapon import BaseAmmo, BaseWeapon
+
+
+class ProjectileStore:
+    """
+    Pool of projectiles with their state in preallocated NumPy arrays
+
+    Like EnemyStore, ammo objects become thin views into the arrays once appended and removal swaps the last
+    projectile into the freed slot. Removed ammo is kept per class and handed back out by acquire, so a weapon firing
+    many times a second resets old projectiles instead of allocating new ones.
+    Projectiles fly in a straight line, so their direction and time to live are worked out once when appended.
+    """
+
+    # Seconds of flight left that count as arrived, so rounding the time to live down tick by tick never costs a tick
+    ARRIVAL_TOLERANCE: float = 1e-9
+
+    COLUMNS: tuple[str, ...] = ("locations", "previous_locations", "directions", "speeds", "time_to_live", "sizes", "draw_offsets")
+
+    def __init__(self, capacity: int = 256):
+        self.count: int = 0
+        self.ammo: list["BaseAmmo"] = []
+        # Weapon that fired the projectile in the same slot
+        self.owners: list["BaseWeapon"] = []
+        self.free: dict[type, list["BaseAmmo"]] = {}
+
+        self.locations: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        self.previous_locations: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        # Unit vector towards the target
+        self.directions: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        self.speeds: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        # Seconds of flight left until the target is reached
+        self.time_to_live: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        self.sizes: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        # How far a rotated sprite reaches past its hitbox on each side
+        self.draw_offsets: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.locations)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator["BaseAmmo"]:
+        return iter(self.ammo)
+
+    def __contains__(self, ammo: "BaseAmmo") -> bool:
+        return getattr(ammo, "store", None) is self
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name in self.COLUMNS:
+            column: np.ndarray = getattr(self, name)
+            grown = np.zeros((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[: self.count] = column[: self.count]
+            setattr(self, name, grown)
+
+    def acquire(self, ammo_class: type) -> "BaseAmmo | None":
+        """:return: A removed projectile of the class to reset and append again, or None if there is none"""
+        free = self.free.get(ammo_class)
+        return free.pop() if free else None
+
+    def append(self, ammo: "BaseAmmo", owner: "BaseWeapon"):
+        if self.count == self.capacity:
+            self._grow()
+
+        index = self.count
+        location = ammo.current_location
+        self.locations[index] = location.to_tuple()
+        self.previous_locations[index] = ammo.previous_location.to_tuple()
+        self.sizes[index] = ammo.hitbox_size
+        self.draw_offsets[index] = ammo.draw_offset
+
+        offset = ammo.target_location - location
+        distance = offset.length()
+        speed = ammo.base_ammo_speed
+        self.directions[index] = (offset / distance).to_tuple() if distance else (0.0, 0.0)
+        self.speeds[index] = speed
+        if distance == 0:
+            self.time_to_live[index] = 0.0
+        else:
+            self.time_to_live[index] = distance / speed if speed > 0 else float("inf")
+
+        self.ammo.append(ammo)
+        self.owners.append(owner)
+        self.count += 1
+        ammo.attach(self, index)
+
+    def remove(self, ammo: "BaseAmmo"):
+        if ammo not in self:
+            raise ValueError("Ammo is not in this store")
+
+        index = ammo.index
+        last = self.count - 1
+        ammo.detach()
+
+        # Move the last projectile into the freed slot
+        if index != last:
+            for name in self.COLUMNS:
+                column: np.ndarray = getattr(self, name)
+                column[index] = column[last]
+            moved = self.ammo[last]
+            self.ammo[index] = moved
+            self.owners[index] = self.owners[last]
+            moved.index = index
+
+        self.ammo.pop()
+        self.owners.pop()
+        self.count -= 1
+        self.free.setdefault(type(ammo), []).append(ammo)
+
+    def step(self, delta_time: float) -> list["BaseAmmo"]:
+        """
+        Move every projectile along its direction, the last step only covers what is left of the flight
+        :return: The projectiles that reached their target this tick, to remove before they collide
+        """
+        count = self.count
+        locations = self.locations[:count]
+        self.previous_locations[:count] = locations
+
+        time_to_live = self.time_to_live[:count]
+        flight_time = np.clip(time_to_live, 0, delta_time)
+        locations += self.directions[:count] * (self.speeds[:count] * flight_time)[:, None]
+        time_to_live -= delta_time
+        return [self.ammo[index] for index in np.flatnonzero(time_to_live <= self.ARRIVAL_TOLERANCE).tolist()]
+
+    def owner(self, ammo: "BaseAmmo") -> "BaseWeapon":
+        return self.owners[ammo.index]
+
+    def bounds(self) -> np.ndarray:
+        """:return: The left, top, width and height of every projectile"""
+        return np.hstack((self.locations[: self.count], self.sizes[: self.count]))
+
+    def interpolated(self, alpha: float) -> np.ndarray:
+        """:return: The location to draw every projectile at between its last two ticks"""
+        count = self.count
+        previous = self.previous_locations[:count] - self.draw_offsets[:count]
+        return previous + (self.locations[:count] - self.previous_locations[:count]) * alpha
+
+    def interpolated_locations(self, alpha: float) -> list[list[float]]:
+        return self.interpolated(alpha).tolist()
+
+    def draw_sizes(self) -> np.ndarray:
+        """:return: The size of every projectile's sprite, larger than its hitbox when rotated"""
+        return self.sizes[: self.count] + self.draw_offsets[: self.count] * 2